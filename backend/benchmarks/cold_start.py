@@ -0,0 +1,121 @@
+"""콜드 스타트 측정.
+
+새 프로세스에서 `import main`에 걸리는 시간과, uvicorn 프로세스를 띄운 뒤
+/health가 처음 200을 돌려줄 때까지의 시간을 여러 번 재서 중앙값을 보고한다.
+가장 오래 걸리는 모듈은 -X importtime 결과에서 뽑아 보여준다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --runs 10 --redis-url redis://10.255.255.1:6379  # 응답 없는 Redis
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEALTH_POLL_INTERVAL = 0.01
+HEALTH_TIMEOUT = 60.0
+
+
+def _env(redis_url: str, prewarm: bool) -> dict:
+    env = dict(os.environ)
+    env["REDIS_URL"] = redis_url
+    env["PREWARM"] = "true" if prewarm else "false"
+    return env
+
+
+def measure_import(env: dict) -> Tuple[float, List[Tuple[int, str]]]:
+    """새 인터프리터에서 import main 시간(초)과 누적 시간이 큰 모듈 목록"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    elapsed = time.perf_counter() - started
+
+    modules = []
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = len(name) - len(name.lstrip())
+        if depth <= 3:  # 최상위 근처 모듈만
+            modules.append((int(parts[1]), name.strip()))
+    modules.sort(reverse=True)
+    return elapsed, modules
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_health(env: dict) -> float:
+    """uvicorn 프로세스 시작부터 /health 첫 200 응답까지의 시간(초)"""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < HEALTH_TIMEOUT:
+            if process.poll() is not None:
+                raise RuntimeError(f"서버가 종료됨 (exit {process.returncode})")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                pass
+            time.sleep(HEALTH_POLL_INTERVAL)
+        raise RuntimeError(f"{HEALTH_TIMEOUT:g}초 안에 /health 응답 없음")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="콜드 스타트 측정 (import 시간, 첫 /health 200까지 시간)")
+    parser.add_argument("--runs", type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379"))
+    parser.add_argument("--prewarm", action="store_true", help="PREWARM=true로 실행")
+    parser.add_argument("--top", type=int, default=10, help="보여줄 느린 모듈 수")
+    args = parser.parse_args(argv)
+
+    env = _env(args.redis_url, args.prewarm)
+
+    import_times, health_times = [], []
+    modules: List[Tuple[int, str]] = []
+    for _ in range(args.runs):
+        elapsed, modules = measure_import(env)
+        import_times.append(elapsed)
+        health_times.append(measure_first_health(env))
+
+    print(f"Python {sys.version.split()[0]}, {args.runs}회 측정, REDIS_URL={args.redis_url}")
+    print(f"{'import main (프로세스 포함)':<28} 중앙값 {statistics.median(import_times) * 1000:>7.0f}ms"
+          f"  최소 {min(import_times) * 1000:>7.0f}ms")
+    print(f"{'첫 /health 200':<28} 중앙값 {statistics.median(health_times) * 1000:>7.0f}ms"
+          f"  최소 {min(health_times) * 1000:>7.0f}ms")
+
+    print(f"\n누적 import 시간 상위 {args.top}개 (마지막 측정)")
+    for cumulative_us, name in modules[:args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f}ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
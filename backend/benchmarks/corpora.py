@@ -0,0 +1,173 @@
+"""벤치마크용 재현 가능한 합성 코퍼스 생성기.
+
+모든 생성기는 고정 시드를 사용하므로 같은 입력이 매번 만들어진다.
+"""
+import random
+from io import BytesIO
+from typing import List
+
+EN_WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or his from at which "
+    "but have an they you were her she there one all we their can has been if more when will would "
+    "who so no market council budget transit housing growth policy research data model system "
+    "language attention summary important chapter analysis result report evidence method review "
+    "government company investment student teacher science history economy network energy climate"
+).split()
+
+KO_WORDS = (
+    "그리고 하지만 또한 정부는 기업이 연구진은 발표했다 밝혔다 있다 없다 것으로 위해 대한 통해 "
+    "경제 시장 예산 교통 주택 성장 정책 연구 데이터 모델 시스템 언어 요약 중요한 장 분석 결과 "
+    "보고서 근거 방법 검토 투자 학생 교사 과학 역사 네트워크 에너지 기후 지난 올해 내년 처음"
+).split()
+
+
+def _sentence(rng: random.Random, vocab: List[str], korean: bool) -> str:
+    words = [rng.choice(vocab) for _ in range(rng.randint(6, 24))]
+    if rng.random() < 0.3:
+        words.insert(rng.randint(0, len(words)), str(rng.randint(1, 2030)))
+    sentence = " ".join(words)
+    if not korean:
+        sentence = sentence[0].upper() + sentence[1:]
+    return sentence + "."
+
+
+def make_text(size: int, korean: bool = False, chapters: bool = False, seed: int = 0) -> str:
+    """size 자 내외의 문단 구조 텍스트를 생성합니다."""
+    rng = random.Random(seed)
+    vocab = KO_WORDS if korean else EN_WORDS
+    parts = []
+    length = 0
+    chapter = 1
+
+    while length < size:
+        if chapters and (not parts or rng.random() < 0.02):
+            heading = f"제{chapter}장 " if korean else f"Chapter {chapter} "
+            heading += " ".join(rng.choice(vocab) for _ in range(3))
+            parts.append(heading)
+            chapter += 1
+
+        paragraph = " ".join(_sentence(rng, vocab, korean) for _ in range(rng.randint(2, 7)))
+        parts.append(paragraph)
+        length += len(paragraph) + 2
+
+    return "\n\n".join(parts)[:size]
+
+
+def make_keywords(text: str, count: int = 30, seed: int = 0) -> List[dict]:
+    """텍스트에서 실제 문장 일부를 뽑아 LLM 응답 형태의 키워드를 만듭니다."""
+    rng = random.Random(seed)
+    sentences = [s.strip() for s in text.replace("\n", " ").split(".") if len(s.split()) >= 6]
+    picked = rng.sample(sentences, min(count, len(sentences)))
+    return [{"text": " ".join(s.split()[:rng.randint(5, 12)]), "score": rng.choice([0.6, 0.8, 0.9])}
+            for s in picked]
+
+
+def make_pdf_chars(pages: int, lines_per_page: int = 40, seed: int = 0) -> List[List[dict]]:
+    """pdfplumber page.chars 형태의 문자 딕셔너리를 페이지별로 생성합니다."""
+    rng = random.Random(seed)
+    result = []
+
+    for page_no in range(pages):
+        chars = []
+        for line_no in range(lines_per_page):
+            size = 18.0 if line_no == 0 else 11.0
+            top = 72 + line_no * 16 + rng.uniform(-0.5, 0.5)
+            line = _sentence(rng, EN_WORDS, False)[:90]
+            x = 72.0
+            for ch in line:
+                chars.append({"text": ch, "size": size, "top": top, "x0": x})
+                x += size * 0.5
+        # pdfplumber는 문서 순서대로 주지 않을 수 있으므로 섞는다
+        rng.shuffle(chars)
+        result.append(chars)
+
+    return result
+
+
+def make_body_lines(count: int, seed: int = 0) -> List[str]:
+    """_merge_body_lines 입력 형태(줄 목록, 빈 줄은 문단 구분)를 생성합니다."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        r = rng.random()
+        if r < 0.05:
+            lines.append("")
+        else:
+            line = _sentence(rng, EN_WORDS, False)[: rng.randint(40, 90)]
+            if r < 0.15:
+                line = line.rstrip(".") + "-"
+            lines.append(line)
+    return lines
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: int, lines_per_page: int = 40, seed: int = 0) -> bytes:
+    """외부 라이브러리 없이 Helvetica 텍스트 PDF를 생성합니다. (영문 전용)
+
+    매 페이지에 머리글/쪽번호를 넣어 실제 책 PDF와 비슷하게 만든다.
+    """
+    rng = random.Random(seed)
+    objects = []
+
+    def add(body: str) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add("")  # 나중에 채움
+    pages_id = add("")
+    font_id = add("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for page_no in range(pages):
+        ops = ["BT /F1 9 Tf 72 760 Td (Synthetic Benchmark Book) Tj ET"]
+        y = 720
+        for line_no in range(lines_per_page):
+            size = 18 if line_no == 0 and page_no % 5 == 0 else 11
+            line = _pdf_escape(_sentence(rng, EN_WORDS, False)[:85])
+            ops.append(f"BT /F1 {size} Tf 72 {y} Td ({line}) Tj ET")
+            y -= 16
+        ops.append(f"BT /F1 9 Tf 300 40 Td ({page_no + 1}) Tj ET")
+        stream = "\n".join(ops)
+        content_id = add(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ))
+
+    objects[catalog_id - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>"
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>"
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    xref_at = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(
+        f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_id} 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode("latin-1")
+    )
+    return out.getvalue()
+
+
+def make_docx(paragraphs: int, korean: bool = False, seed: int = 0) -> bytes:
+    """python-docx로 문단 수가 정해진 DOCX를 생성합니다."""
+    from docx import Document
+
+    rng = random.Random(seed)
+    vocab = KO_WORDS if korean else EN_WORDS
+    doc = Document()
+    for _ in range(paragraphs):
+        doc.add_paragraph(" ".join(_sentence(rng, vocab, korean) for _ in range(rng.randint(2, 6))))
+
+    out = BytesIO()
+    doc.save(out)
+    return out.getvalue()
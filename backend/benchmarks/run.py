@@ -0,0 +1,252 @@
+"""텍스트 파이프라인 핵심 함수 마이크로 벤치마크.
+
+함수별 실행 시간(중앙값)과 최대 메모리(tracemalloc)를 측정하고,
+저장된 기준값과 비교하여 PR의 성능 변화를 보여준다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.run                       # 측정 후 기준값과 비교
+    python -m benchmarks.run --save-baseline       # 현재 결과를 기준값으로 저장
+    python -m benchmarks.run --filter split --quick
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from benchmarks import corpora
+from services.cache import MemoryCache
+from services.extraction import split_into_words, split_into_chunks, split_by_size, match_keywords, match_keywords_to_words
+from services.file_parser import (
+    _group_chars_into_lines,
+    _merge_body_lines,
+    extract_text_from_pdf,
+    extract_text_from_docx,
+)
+from services.scoring import score_text_fast
+from services.tokens import tokenize
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+TARGET_SECONDS = 0.5  # 케이스당 목표 측정 시간
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], tuple]  # 측정에서 제외할 입력 준비
+    func: Callable
+    slow: bool = False          # --quick에서 제외
+
+
+def _memory_cache_workload(keys: List[str]):
+    cache = MemoryCache(max_size=1000)
+    for key in keys:
+        cache.set(key, key, ttl=60)
+        cache.get(key)
+    for key in keys[::3]:
+        cache.get(key)
+
+
+def build_cases() -> List[Case]:
+    cases = []
+
+    texts = {
+        "short_en": lambda: corpora.make_text(1_000),
+        "short_ko": lambda: corpora.make_text(1_000, korean=True),
+        "article_en": lambda: corpora.make_text(50_000),
+        "article_ko": lambda: corpora.make_text(50_000, korean=True),
+        "book_en": lambda: corpora.make_text(2_000_000, chapters=True),
+        "book_ko": lambda: corpora.make_text(2_000_000, korean=True, chapters=True),
+    }
+
+    for label, make in texts.items():
+        slow = label.startswith("book")
+        cases.append(Case(f"split_into_words[{label}]", lambda make=make: (make(),), split_into_words, slow))
+        cases.append(Case(f"tokenize[{label}]", lambda make=make: (make(),), tokenize, slow))
+        if not label.startswith("short"):
+            cases.append(Case(f"split_into_chunks[{label}]", lambda make=make: (make(),), split_into_chunks, slow))
+
+    cases.append(Case(
+        "split_by_size[book_en]",
+        lambda: (corpora.make_text(2_000_000),),
+        split_by_size,
+        slow=True,
+    ))
+
+    for label, korean in (("chunk_en", False), ("chunk_ko", True), ("article_en", False)):
+        size = 50_000 if label.startswith("article") else 5_000
+
+        def setup(size=size, korean=korean):
+            text = corpora.make_text(size, korean=korean)
+            return split_into_words(text), corpora.make_keywords(text)
+
+        cases.append(Case(f"match_keywords_to_words[{label}]", setup, match_keywords_to_words))
+
+        def setup_table(size=size, korean=korean):
+            text = corpora.make_text(size, korean=korean)
+            return tokenize(text), corpora.make_keywords(text)
+
+        cases.append(Case(f"match_keywords[{label}]", setup_table, match_keywords))
+
+    cases.append(Case(
+        "score_text_fast[chunk_en]",
+        lambda: (corpora.make_text(5_000),),
+        score_text_fast,
+    ))
+
+    for pages in (1, 10, 50):
+        cases.append(Case(
+            f"_group_chars_into_lines[{pages}p]",
+            lambda pages=pages: (corpora.make_pdf_chars(pages),),
+            lambda pages_chars: [_group_chars_into_lines(chars) for chars in pages_chars],
+        ))
+
+    cases.append(Case(
+        "_merge_body_lines[20k lines]",
+        lambda: (corpora.make_body_lines(20_000), 11.0),
+        _merge_body_lines,
+    ))
+
+    for pages in (1, 10, 50):
+        cases.append(Case(
+            f"extract_text_from_pdf[{pages}p]",
+            lambda pages=pages: (corpora.make_pdf(pages),),
+            extract_text_from_pdf,
+            slow=pages >= 50,
+        ))
+
+    for paragraphs, korean in ((100, False), (1_000, True)):
+        label = f"{paragraphs}para_{'ko' if korean else 'en'}"
+        cases.append(Case(
+            f"extract_text_from_docx[{label}]",
+            lambda paragraphs=paragraphs, korean=korean: (corpora.make_docx(paragraphs, korean),),
+            extract_text_from_docx,
+        ))
+
+    cases.append(Case(
+        "MemoryCache[10k set/get, 1k capacity]",
+        lambda: ([f"analyze:model:{i:016x}" for i in range(10_000)],),
+        _memory_cache_workload,
+    ))
+
+    return cases
+
+
+def measure(case: Case) -> dict:
+    args = case.setup()
+
+    # 실행 시간: 목표 시간을 채울 때까지 반복 후 중앙값
+    timings = []
+    total = 0.0
+    while len(timings) < MIN_REPEATS or (total < TARGET_SECONDS and len(timings) < MAX_REPEATS):
+        gc.collect()
+        started = time.perf_counter()
+        case.func(*args)
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed)
+        total += elapsed
+
+    # 최대 메모리: 별도 1회 실행 (tracemalloc은 실행을 느리게 하므로 시간 측정과 분리)
+    gc.collect()
+    tracemalloc.start()
+    case.func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+        "repeats": len(timings),
+    }
+
+
+def _delta(current: float, base: Optional[float]) -> str:
+    if not base:
+        return "-"
+    return f"{(current - base) / base * 100:+.1f}%"
+
+
+def report(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """결과 표를 출력하고, 기준값 대비 threshold(%) 이상 느려진 케이스 목록을 반환합니다."""
+    regressions = []
+    name_width = max(len(name) for name in results)
+
+    print(f"{'benchmark':<{name_width}}  {'median ms':>11}  {'Δ time':>8}  {'peak KB':>10}  {'Δ mem':>8}")
+    print("-" * (name_width + 46))
+
+    for name, result in results.items():
+        base = baseline.get(name, {})
+        time_delta = _delta(result["median_ms"], base.get("median_ms"))
+        mem_delta = _delta(result["peak_kb"], base.get("peak_kb"))
+        print(
+            f"{name:<{name_width}}  {result['median_ms']:>11,.3f}  {time_delta:>8}  "
+            f"{result['peak_kb']:>10,.1f}  {mem_delta:>8}"
+        )
+
+        if base.get("median_ms") and result["median_ms"] > base["median_ms"] * (1 + threshold / 100):
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="텍스트 파이프라인 마이크로 벤치마크")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 케이스만 실행")
+    parser.add_argument("--quick", action="store_true", help="2백만자 책/50쪽 PDF 등 느린 케이스 제외")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준값으로 저장")
+    parser.add_argument("--threshold", type=float, default=10.0, help="회귀로 판단할 느려짐 비율(%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    cases = [
+        case for case in build_cases()
+        if args.filter in case.name and not (args.quick and case.slow)
+    ]
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    results = {}
+    for case in cases:
+        print(f"측정 중: {case.name}", file=sys.stderr)
+        results[case.name] = measure(case)
+
+    print()
+    regressions = report(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        # 일부만 실행한 경우 기존 기준값은 유지하고 측정한 케이스만 갱신
+        merged = {**baseline, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                "results": merged,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {args.baseline}")
+
+    if regressions:
+        print(f"\n{args.threshold:.0f}% 이상 느려진 케이스: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""핫 사전 파일 생성 CLI.
+
+Redis의 단어 조회 빈도 상위 단어 중 번역이 캐시에 있는 것을 JSON 파일로 내보냅니다.
+만든 파일을 HOT_DICTIONARY_PATH로 지정하면 시작 시 Redis 없이 바로 로드됩니다.
+
+사용법:
+    python build_hot_dictionary.py hot_dictionary.json --size 5000
+"""
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from config import REDIS_URL
+from services.cache import cache
+from services.dictionary import HotDictionary
+
+logger = logging.getLogger("build_hot_dictionary")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="조회 빈도 상위 단어 번역을 핫 사전 파일로 내보내기")
+    parser.add_argument("output", type=Path, help="출력 JSON 파일")
+    parser.add_argument("--size", type=int, default=5000, help="최대 단어 수")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    return args
+
+
+async def run(args: argparse.Namespace):
+    await cache.initialize(REDIS_URL)
+    if not cache.is_redis_connected:
+        raise SystemExit("Redis에 연결할 수 없습니다. 조회 빈도 기록은 Redis에만 남습니다.")
+
+    try:
+        entries = await HotDictionary(size=args.size).build_from_cache()
+    finally:
+        await cache.close()
+
+    tmp_path = args.output.with_name(args.output.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, indent=0, sort_keys=True)
+    tmp_path.replace(args.output)
+    logger.info(f"{len(entries)}개 단어 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
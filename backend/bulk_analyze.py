@@ -0,0 +1,301 @@
+"""디렉터리 단위 대량 분석 CLI (캐시 예열용).
+
+PDF/DOCX/TXT 파일을 일괄로 텍스트 추출 → 청크 분할 → Haiku 분석하여
+API와 동일한 `file:`/`analyze:` 캐시 키에 저장하고 JSONL로도 기록합니다.
+중단되더라도 체크포인트 파일로부터 이어서 처리합니다.
+
+사용법:
+    python bulk_analyze.py ./library --output results.jsonl --concurrency 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from config import REDIS_URL, HAIKU_MODEL, CACHE_TTL_FILE, CACHE_TTL_ANALYZE, CACHE_STALE_TTL
+from services.cache import cache, CacheService
+from services.extraction import (
+    MAX_CONCURRENT_CHUNKS,
+    extract_important_parts_single_chunk,
+    split_into_chunks,
+)
+from services.file_parser import extract_text
+from services.upstream import Priority
+
+logger = logging.getLogger("bulk_analyze")
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+def find_documents(root: Path) -> List[Path]:
+    """지원하는 확장자의 파일을 재귀적으로 찾아 정렬된 목록으로 반환합니다."""
+    return sorted(
+        path for path in root.rglob("*")
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+
+
+class Checkpoint:
+    """완료된 문서/청크를 기록하여 중단 후 재개를 지원합니다.
+
+    형식: {"documents": {file_key: {"path": str, "total_chunks": int,
+                                    "done": [청크 인덱스...], "completed": bool}}}
+
+    청크 완료는 메모리에 모았다가 save_interval초마다 한 번 파일에 씁니다
+    (문서 완료와 종료 시에는 바로 기록). 중단되면 마지막 저장 이후의 청크는
+    다시 처리되지만 분석 결과는 캐시에 있으므로 업스트림 호출 없이 끝납니다.
+    """
+
+    def __init__(self, path: Path, save_interval: float = 5.0):
+        self._path = path
+        self._documents: dict = {}
+        self._save_interval = save_interval
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                self._documents = json.load(f).get("documents", {})
+
+    def is_completed(self, file_key: str) -> bool:
+        return self._documents.get(file_key, {}).get("completed", False)
+
+    def done_chunks(self, file_key: str) -> set:
+        return set(self._documents.get(file_key, {}).get("done", []))
+
+    def mark_chunk(self, file_key: str, path: str, total_chunks: int, chunk_index: int):
+        doc = self._documents.setdefault(
+            file_key, {"path": path, "total_chunks": total_chunks, "done": [], "completed": False}
+        )
+        if chunk_index not in doc["done"]:
+            doc["done"].append(chunk_index)
+            self._dirty = True
+        if self._dirty and time.monotonic() - self._saved_at >= self._save_interval:
+            self.save()
+
+    def mark_completed(self, file_key: str, path: str, total_chunks: int):
+        doc = self._documents.setdefault(
+            file_key, {"path": path, "total_chunks": total_chunks, "done": [], "completed": False}
+        )
+        doc["completed"] = True
+        self.save()
+
+    def flush(self):
+        """아직 기록하지 않은 청크 완료가 있으면 저장"""
+        if self._dirty:
+            self.save()
+
+    def save(self):
+        # 임시 파일에 쓴 뒤 교체하여 중단 시에도 체크포인트가 깨지지 않도록 함
+        tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"documents": self._documents}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    @property
+    def completed_count(self) -> int:
+        return sum(1 for doc in self._documents.values() if doc.get("completed"))
+
+
+class BulkAnalyzer:
+    """파일/청크 단위 동시성을 제한하며 문서들을 분석합니다.
+
+    파일 슬롯은 파싱부터 마지막 청크 분석까지 유지하므로 메모리에 올라가는
+    문서(원본/텍스트/청크)는 최대 file_concurrency개입니다.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        checkpoint: Checkpoint,
+        concurrency: int = MAX_CONCURRENT_CHUNKS,
+        file_concurrency: int = 2,
+    ):
+        self._output = open(output_path, "a", encoding="utf-8")
+        self._checkpoint = checkpoint
+        self._chunk_semaphore = asyncio.Semaphore(concurrency)
+        self._file_semaphore = asyncio.Semaphore(file_concurrency)
+
+        self.documents_done = 0
+        self.documents_failed = 0
+        self.documents_skipped = 0
+        self.chunks_analyzed = 0
+        self.chunks_cached = 0
+        self._started_at = time.monotonic()
+
+    def close(self):
+        self._output.close()
+
+    @property
+    def documents_per_hour(self) -> float:
+        elapsed = time.monotonic() - self._started_at
+        if elapsed <= 0:
+            return 0.0
+        return self.documents_done / elapsed * 3600
+
+    async def process_all(self, paths: List[Path]):
+        await asyncio.gather(*(self._process_document(path) for path in paths))
+
+    async def _process_document(self, path: Path):
+        async with self._file_semaphore:
+            await self._process_document_in_slot(path)
+
+    async def _process_document_in_slot(self, path: Path):
+        content = path.read_bytes()
+        sha256 = CacheService.hash_content(content)
+        file_key = CacheService.make_file_key_from_hash(sha256)
+
+        if self._checkpoint.is_completed(file_key):
+            self.documents_skipped += 1
+            logger.info(f"건너뜀 (체크포인트): {path}")
+            return
+
+        try:
+            text = await self._load_text(path, content, sha256)
+        except Exception as e:
+            self.documents_failed += 1
+            logger.error(f"텍스트 추출 실패: {path} ({e})")
+            return
+        finally:
+            del content
+
+        if not text:
+            self.documents_failed += 1
+            logger.warning(f"텍스트 없음: {path}")
+            return
+
+        chunks = split_into_chunks(text)
+        done = self._checkpoint.done_chunks(file_key)
+
+        results = await asyncio.gather(
+            *(
+                self._process_chunk(path, file_key, chunks, idx)
+                for idx in range(len(chunks))
+                if idx not in done
+            ),
+            return_exceptions=True,
+        )
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            self.documents_failed += 1
+            logger.error(f"청크 분석 실패: {path} ({len(errors)}개 청크, 첫 오류: {errors[0]})")
+            return
+
+        self._checkpoint.mark_completed(file_key, str(path), len(chunks))
+        self.documents_done += 1
+        logger.info(
+            f"완료: {path} ({len(chunks)}개 청크) - "
+            f"{self.documents_per_hour:,.1f} 문서/시간"
+        )
+
+    async def _load_text(self, path: Path, content: bytes, sha256: str) -> str:
+        """파일 캐시를 확인하고, 없으면 텍스트를 추출하여 API와 같은 형식으로 저장합니다."""
+        file_key = CacheService.make_file_key_from_hash(sha256)
+        cached_file = await cache.get(file_key)
+        if cached_file:
+            return json.loads(cached_file)["text"]
+
+        # 파싱은 CPU 작업이므로 스레드에서 실행
+        text = await asyncio.to_thread(extract_text, path.name, content)
+        text = text.strip()
+
+        if text:
+            chunks = split_into_chunks(text)
+            await cache.set(
+                file_key,
+                json.dumps({
+                    "text": text,
+                    "total_chunks": len(chunks),
+                    "total_characters": len(text),
+                }),
+                CACHE_TTL_FILE,
+            )
+            await cache.set_file_meta(sha256, len(content), CACHE_TTL_FILE)
+        return text
+
+    async def _process_chunk(self, path: Path, file_key: str, chunks: List[str], chunk_index: int):
+        chunk_text = chunks[chunk_index]
+        cache_key = CacheService.make_analyze_key(HAIKU_MODEL, chunk_text)
+
+        async with self._chunk_semaphore:
+            cached_result = await cache.get(cache_key)
+            if cached_result:
+                data = json.loads(cached_result)
+                words, scores = data["words"], data["scores"]
+                cached = True
+                self.chunks_cached += 1
+            else:
+                words, scores = await extract_important_parts_single_chunk(chunk_text, Priority.BULK)
+                await cache.set(
+                    cache_key, json.dumps({"words": words, "scores": scores}), CACHE_TTL_ANALYZE, CACHE_STALE_TTL
+                )
+                cached = False
+                self.chunks_analyzed += 1
+
+        record = {
+            "path": str(path),
+            "file_key": file_key,
+            "cache_key": cache_key,
+            "chunk_index": chunk_index,
+            "total_chunks": len(chunks),
+            "words": words,
+            "scores": scores,
+            "cached": cached,
+        }
+        # JSONL을 먼저 기록한 뒤 체크포인트 갱신 (중단 시 최대 1줄 중복 가능)
+        self._output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._output.flush()
+        self._checkpoint.mark_chunk(file_key, str(path), len(chunks), chunk_index)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="디렉터리의 문서를 일괄 분석하여 캐시를 예열합니다.")
+    parser.add_argument("directory", type=Path, help="분석할 문서가 있는 디렉터리")
+    parser.add_argument("--output", type=Path, default=Path("bulk_results.jsonl"), help="결과 JSONL 경로")
+    parser.add_argument("--checkpoint", type=Path, default=None, help="체크포인트 경로 (기본: <output>.checkpoint.json)")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_CHUNKS, help="동시 분석 청크 수")
+    parser.add_argument("--file-concurrency", type=int, default=2, help="동시에 처리하는 문서 수 (파싱~분석 완료)")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace):
+    if not args.directory.is_dir():
+        raise SystemExit(f"디렉터리가 아닙니다: {args.directory}")
+
+    checkpoint_path = args.checkpoint or args.output.with_name(args.output.name + ".checkpoint.json")
+    checkpoint = Checkpoint(checkpoint_path)
+
+    paths = find_documents(args.directory)
+    logger.info(
+        f"{len(paths)}개 문서 발견 (체크포인트 완료: {checkpoint.completed_count}개), "
+        f"동시성: 청크 {args.concurrency} / 파일 {args.file_concurrency}"
+    )
+
+    await cache.initialize(REDIS_URL)
+    if not cache.is_redis_connected:
+        logger.warning("Redis 미연결: 결과는 JSONL에만 남고 API 캐시는 예열되지 않습니다.")
+
+    analyzer = BulkAnalyzer(args.output, checkpoint, args.concurrency, args.file_concurrency)
+    try:
+        await analyzer.process_all(paths)
+    finally:
+        analyzer.close()
+        checkpoint.flush()
+        await cache.close()
+
+    logger.info(
+        f"종료: 완료 {analyzer.documents_done}, 건너뜀 {analyzer.documents_skipped}, "
+        f"실패 {analyzer.documents_failed} / 청크 분석 {analyzer.chunks_analyzed}, "
+        f"캐시 {analyzer.chunks_cached} - {analyzer.documents_per_hour:,.1f} 문서/시간"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -6,6 +6,7 @@ load_dotenv()
 # Anthropic API
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 HAIKU_MODEL = os.getenv("HAIKU_MODEL", "claude-3-5-haiku-latest")
+ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL") or None  # 부하 테스트 시 가짜 서버 주소
 
 # Limits (청킹으로 긴 텍스트 지원)
 MAX_CHARACTERS = int(os.getenv("MAX_CHARACTERS", "2000000"))  # 2백만자
@@ -18,3 +19,63 @@ REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 CACHE_TTL_TRANSLATE = int(os.getenv("CACHE_TTL_TRANSLATE", "86400"))  # 24시간
 CACHE_TTL_FILE = int(os.getenv("CACHE_TTL_FILE", "3600"))             # 1시간
 CACHE_TTL_ANALYZE = int(os.getenv("CACHE_TTL_ANALYZE", "86400"))      # 24시간
+
+# 분석/번역 캐시 stale-while-revalidate
+# 위 TTL이 지난 뒤에도 이 시간(초) 동안은 오래된 값을 바로 반환하고 백그라운드에서 갱신
+CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", "21600"))  # 6시간
+# 만료 직전 확률적 조기 갱신 강도 (XFetch beta, 0이면 끔)
+CACHE_EARLY_REFRESH_BETA = float(os.getenv("CACHE_EARLY_REFRESH_BETA", "1.0"))
+
+# 이 크기(바이트) 이상인 JSON/텍스트 응답을 gzip/brotli로 압축
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Upstream (Haiku) 호출 한도 (0이면 무제한)
+UPSTREAM_RPM = int(os.getenv("UPSTREAM_RPM", "0"))                        # 분당 요청 수
+UPSTREAM_TPM = int(os.getenv("UPSTREAM_TPM", "0"))                        # 분당 토큰 수
+# 같은 API 키로 업스트림을 호출하는 프로세스 수 (API 서버 + worker.py). 한도는 프로세스마다 따로 세므로
+# 각 프로세스는 RPM/TPM을 이 수로 나눈 만큼만 사용 (JOB_QUEUE_MODE=redis면 워커 수만큼 늘릴 것)
+UPSTREAM_PROCESSES = max(1, int(os.getenv("UPSTREAM_PROCESSES", "1")))
+UPSTREAM_MAX_CONCURRENCY = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "10"))  # 동시 호출 수
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "4"))        # 429/529 재시도 횟수
+UPSTREAM_TIMEOUT_ANALYZE = float(os.getenv("UPSTREAM_TIMEOUT_ANALYZE", "90"))      # 청크 분석 호출당 제한 시간(초)
+UPSTREAM_TIMEOUT_TRANSLATE = float(os.getenv("UPSTREAM_TIMEOUT_TRANSLATE", "30"))  # 번역 호출당 제한 시간(초)
+UPSTREAM_HEDGE_MAX_RATIO = float(os.getenv("UPSTREAM_HEDGE_MAX_RATIO", "0"))      # 헤징 호출 비율 상한 (0이면 헤징 끔)
+
+# 모델을 호출하는 요청의 입장 제어 (경로 종류별 동시 처리 수 / 대기열 길이 / 대기 제한 시간(초))
+# 자리를 받지 못하면 503 + Retry-After. 동시 처리 수가 0이면 제한 없음. 캐시 적중은 대기열을 거치지 않음
+ADMISSION_ANALYZE_CONCURRENCY = int(os.getenv("ADMISSION_ANALYZE_CONCURRENCY", "8"))
+ADMISSION_ANALYZE_QUEUE = int(os.getenv("ADMISSION_ANALYZE_QUEUE", "32"))
+ADMISSION_ANALYZE_TIMEOUT = float(os.getenv("ADMISSION_ANALYZE_TIMEOUT", "15"))
+ADMISSION_TRANSLATE_CONCURRENCY = int(os.getenv("ADMISSION_TRANSLATE_CONCURRENCY", "16"))
+ADMISSION_TRANSLATE_QUEUE = int(os.getenv("ADMISSION_TRANSLATE_QUEUE", "64"))
+ADMISSION_TRANSLATE_TIMEOUT = float(os.getenv("ADMISSION_TRANSLATE_TIMEOUT", "5"))
+
+# 작업 대기열 (inline: 요청 프로세스에서 바로 실행, redis: Redis 대기열 + worker.py 프로세스, memory: 프로세스 안 대기열)
+JOB_QUEUE_MODE = os.getenv("JOB_QUEUE_MODE", "inline").lower()
+JOB_VISIBILITY_TIMEOUT = float(os.getenv("JOB_VISIBILITY_TIMEOUT", "60"))  # 워커 임대 시간(초), 연장이 끊기면 다른 워커가 회수
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))                  # 작업당 최대 시도 횟수
+JOB_RESULT_TIMEOUT = float(os.getenv("JOB_RESULT_TIMEOUT", "180"))         # API가 결과를 기다리는 시간(초)
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "600"))                   # 결과 보관 시간(초)
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))     # 워커 프로세스당 동시 작업 수
+
+# 읽기 세션 WebSocket (/api/ws)
+WS_PREFETCH_CHUNKS = int(os.getenv("WS_PREFETCH_CHUNKS", "1"))  # 청크 요청 뒤 미리 분석해서 보낼 다음 청크 수 (0이면 끔)
+WS_MAX_INFLIGHT = int(os.getenv("WS_MAX_INFLIGHT", "16"))       # 연결당 동시에 처리하는 요청 수 (보내기 대기열 크기도 같음)
+
+# 단어 번역 캐시 키 정규화 시 표제어 변환 (running → run, simplemma 필요)
+WORD_LEMMATIZE = os.getenv("WORD_LEMMATIZE", "false").lower() in ("1", "true", "yes")
+
+# 자주 찾는 단어 번역을 프로세스 메모리에 두는 핫 사전
+HOT_DICTIONARY_PATH = os.getenv("HOT_DICTIONARY_PATH", "")                 # 미리 만든 사전 파일 (JSON 또는 TSV)
+HOT_DICTIONARY_SIZE = int(os.getenv("HOT_DICTIONARY_SIZE", "5000"))        # 조회 빈도 상위 단어 수 (0이면 끔)
+HOT_DICTIONARY_REFRESH = int(os.getenv("HOT_DICTIONARY_REFRESH", "600"))  # 캐시 기록으로 다시 만드는 주기(초)
+
+# LLM 분석 실패 시 로컬 빠른 점수로 대체할지 여부 (제한 시간 초과는 대체하지 않고 504)
+SCORER_FALLBACK = os.getenv("SCORER_FALLBACK", "true").lower() in ("1", "true", "yes")
+
+# 시작 후 백그라운드에서 파서/SDK 로드와 업스트림 연결을 미리 준비 (콜드 스타트 직후 첫 요청 지연 감소)
+PREWARM = os.getenv("PREWARM", "false").lower() in ("1", "true", "yes")
+
+# 관리자 기능 (요청 프로파일링). 비어 있으면 비활성화
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_TTL = int(os.getenv("PROFILE_TTL", "3600"))  # 프로파일 결과 보관 시간(초)
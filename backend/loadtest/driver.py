@@ -0,0 +1,193 @@
+"""API 서버 부하 테스트 드라이버.
+
+/api/analyze, /api/upload, /api/analyze/chunk, /api/translate/* 요청을
+설정한 비율로 섞어 동시성 단계별로 보내고, 엔드포인트별 처리량과
+p50/p95/p99 지연 시간을 보고한다.
+
+사용법 (backend 디렉터리에서, API 서버와 가짜 Anthropic 서버를 띄운 뒤):
+    python -m loadtest.driver --base-url http://127.0.0.1:8000 --concurrency 1,8,32 --duration 30
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks import corpora
+from services.extraction import split_into_chunks
+
+DEFAULT_MIX = "analyze=3,upload=1,chunk=4,translate_word=6,translate_sentence=2,translate_paragraph=1"
+
+
+class Workload:
+    """요청 종류별 본문을 만든다. repeat_ratio 비율만큼은 같은 입력을 재사용하여 캐시 적중을 섞는다.
+
+    PDF/DOCX/텍스트 생성은 CPU를 쓰므로 측정 전에 prepare()로 종류별 요청을 미리 만들어 두고,
+    측정 중에는 next()로 돌아가며 꺼내 쓴다 (생성 시간이 지연 시간에 섞이지 않도록).
+    """
+
+    def __init__(self, repeat_ratio: float, seed: int = 0):
+        self._rng = random.Random(seed)
+        self._repeat_ratio = repeat_ratio
+        self._seed = 1000
+        self._book = corpora.make_text(200_000, chapters=True, seed=seed)
+        self._book_chunks = len(split_into_chunks(self._book))
+        self._pools: Dict[str, List[Tuple[str, dict]]] = {}
+        self._cursors: Dict[str, int] = {}
+
+    def prepare(self, names: List[str], size: int):
+        """요청 종류마다 size개씩 미리 생성"""
+        for name in names:
+            make: Callable = getattr(self, name)
+            self._pools[name] = [make() for _ in range(size)]
+            self._cursors[name] = 0
+
+    def next(self, name: str) -> Tuple[str, dict]:
+        pool = self._pools[name]
+        index = self._cursors[name]
+        self._cursors[name] = (index + 1) % len(pool)
+        return pool[index]
+
+    def _next_seed(self) -> int:
+        if self._rng.random() < self._repeat_ratio:
+            return self._rng.randint(0, 9)
+        self._seed += 1
+        return self._seed
+
+    def analyze(self) -> Tuple[str, dict]:
+        text = corpora.make_text(self._rng.choice([500, 2_000, 8_000]), korean=self._rng.random() < 0.3,
+                                 seed=self._next_seed())
+        return "/api/analyze", {"json": {"text": text}}
+
+    def upload(self) -> Tuple[str, dict]:
+        seed = self._next_seed()
+        kind = self._rng.choice(["txt", "pdf", "docx"])
+        if kind == "pdf":
+            content = corpora.make_pdf(self._rng.choice([1, 5]), seed=seed)
+        elif kind == "docx":
+            content = corpora.make_docx(50, seed=seed)
+        else:
+            content = corpora.make_text(30_000, seed=seed).encode("utf-8")
+        return "/api/upload", {"files": {"file": (f"doc{seed}.{kind}", content)}}
+
+    def chunk(self) -> Tuple[str, dict]:
+        return "/api/analyze/chunk", {
+            "json": {"text": self._book, "chunk_index": self._rng.randrange(self._book_chunks)}
+        }
+
+    def translate_word(self) -> Tuple[str, dict]:
+        word = self._rng.choice(corpora.EN_WORDS)
+        if self._rng.random() < 0.3:
+            word = word.capitalize() + self._rng.choice([",", ".", ""])
+        return "/api/translate/word", {"json": {"word": word}}
+
+    def translate_sentence(self) -> Tuple[str, dict]:
+        text = corpora.make_text(150, seed=self._next_seed())
+        return "/api/translate/sentence", {"json": {"sentence": text}}
+
+    def translate_paragraph(self) -> Tuple[str, dict]:
+        text = corpora.make_text(800, seed=self._next_seed())
+        return "/api/translate/paragraph", {"json": {"paragraph": text}}
+
+
+def parse_mix(mix: str) -> List[Tuple[str, float]]:
+    weights = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights.append((name.strip(), float(weight or 1)))
+    return weights
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    mix: List[Tuple[str, float]],
+    concurrency: int,
+    duration: float,
+) -> Tuple[Dict[str, List[float]], Dict[str, Dict[int, int]], float]:
+    """동시성 수만큼 워커를 띄워 duration 초 동안 요청을 보냅니다."""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    rng = random.Random(concurrency)
+    deadline = time.monotonic() + duration
+
+    async def worker():
+        while time.monotonic() < deadline:
+            path, kwargs = workload.next(rng.choices(names, weights)[0])
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, **kwargs)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0  # 연결 실패/타임아웃
+            latencies[path].append(time.perf_counter() - started)
+            statuses[path][status] += 1
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.monotonic() - started
+
+
+def print_report(concurrency: int, latencies, statuses, elapsed: float):
+    print(f"\n동시성 {concurrency} ({elapsed:.1f}초)")
+    print(f"{'endpoint':<26} {'count':>6} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  status")
+    total = 0
+    for path in sorted(latencies):
+        samples = latencies[path]
+        total += len(samples)
+        codes = " ".join(f"{code}:{count}" for code, count in sorted(statuses[path].items()))
+        print(
+            f"{path:<26} {len(samples):>6} {len(samples) / elapsed:>7.1f} "
+            f"{_percentile(samples, 0.50) * 1000:>8.0f} {_percentile(samples, 0.95) * 1000:>8.0f} "
+            f"{_percentile(samples, 0.99) * 1000:>8.0f}  {codes}"
+        )
+    print(f"{'total':<26} {total:>6} {total / elapsed:>7.1f}")
+
+
+async def run(args: argparse.Namespace):
+    mix = parse_mix(args.mix)
+    workload = Workload(args.repeat_ratio)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    prepare_started = time.monotonic()
+    workload.prepare([name for name, _ in mix], args.pool_size)
+    print(f"요청 {args.pool_size}개 x {len(mix)}종 미리 생성 ({time.monotonic() - prepare_started:.1f}초)")
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        for concurrency in levels:
+            latencies, statuses, elapsed = await run_level(client, workload, mix, concurrency, args.duration)
+            print_report(concurrency, latencies, statuses, elapsed)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="API 부하 테스트 드라이버")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", default="1,8,32", help="쉼표로 구분한 동시성 단계")
+    parser.add_argument("--duration", type=float, default=30.0, help="단계별 실행 시간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="요청 종류=가중치 목록")
+    parser.add_argument("--repeat-ratio", type=float, default=0.3, help="캐시 적중을 유도할 반복 입력 비율")
+    parser.add_argument("--pool-size", type=int, default=200,
+                        help="종류별로 미리 만들어 돌려 쓸 요청 수 (다 쓰면 처음부터 반복)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청별 타임아웃(초)")
+    args = parser.parse_args(argv)
+
+    # 요청마다 찍히는 httpx 로그는 보고서를 가리므로 끈다
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
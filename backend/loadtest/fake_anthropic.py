@@ -0,0 +1,140 @@
+"""부하 테스트용 가짜 Anthropic Messages API 서버.
+
+실제 API 할당량을 쓰지 않고 지연 시간 분포, 429/529 비율, 고정 응답을 흉내 낸다.
+
+사용법 (backend 디렉터리에서):
+    python -m loadtest.fake_anthropic --port 8100 --latency-median 0.8 --rate-429 0.05
+
+API 서버는 다음 환경변수로 이 서버를 바라보게 한다:
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8100 ANTHROPIC_API_KEY=fake uvicorn main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+FAKE_MODELS = ["claude-3-5-haiku-20241022", "claude-3-haiku-20240307"]
+
+# 추출 프롬프트는 "텍스트:\n" 뒤에 원문이 붙는다 (services/extraction.py)
+TEXT_MARKER = "텍스트:\n"
+
+
+@dataclass
+class FakeSettings:
+    latency_median: float = 0.8  # 초, 로그정규분포 중앙값
+    latency_sigma: float = 0.5   # 로그정규분포 sigma (0이면 고정 지연)
+    rate_429: float = 0.0
+    rate_529: float = 0.0
+    retry_after: float = 1.0
+    sentences_per_chunk: int = 8
+    canned_payload: Optional[str] = None  # 고정 {"sentences": [...]} JSON 응답
+
+
+settings = FakeSettings()
+app = FastAPI(title="Fake Anthropic Messages API")
+
+
+def _sample_latency() -> float:
+    if settings.latency_sigma <= 0:
+        return settings.latency_median
+    return random.lognormvariate(0, settings.latency_sigma) * settings.latency_median
+
+
+def _extraction_payload(text: str) -> str:
+    """원문에서 실제 문장을 골라 매칭이 되는 sentences 응답을 만듭니다."""
+    if settings.canned_payload:
+        return settings.canned_payload
+
+    sentences = [s.strip() for s in re.split(r'(?<=[.!?])\s+', text) if len(s.split()) >= 5]
+    picked = random.sample(sentences, min(settings.sentences_per_chunk, len(sentences)))
+    return json.dumps({
+        "sentences": [{"text": s, "score": random.choice([0.6, 0.8, 0.9])} for s in picked]
+    }, ensure_ascii=False)
+
+
+def _error(status: int, error_type: str, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={"type": "error", "error": {"type": error_type, "message": message}},
+        headers={"retry-after": str(settings.retry_after)},
+    )
+
+
+@app.get("/v1/models")
+async def list_models(limit: int = 20):
+    """업스트림 사전 연결(PREWARM)이 부르는 models.list 응답"""
+    models = [
+        {"type": "model", "id": model_id, "display_name": model_id, "created_at": "2024-01-01T00:00:00Z"}
+        for model_id in FAKE_MODELS[:limit]
+    ]
+    return {"data": models, "has_more": False, "first_id": models[0]["id"], "last_id": models[-1]["id"]}
+
+
+@app.post("/v1/messages")
+async def create_message(request: Request):
+    body = await request.json()
+    await asyncio.sleep(_sample_latency())
+
+    roll = random.random()
+    if roll < settings.rate_429:
+        return _error(429, "rate_limit_error", "Fake rate limit")
+    if roll < settings.rate_429 + settings.rate_529:
+        return _error(529, "overloaded_error", "Fake overload")
+
+    prompt = "".join(
+        m["content"] for m in body.get("messages", []) if isinstance(m.get("content"), str)
+    )
+    if TEXT_MARKER in prompt:
+        text = _extraction_payload(prompt.split(TEXT_MARKER, 1)[1])
+    else:
+        text = "번역"
+
+    return {
+        "id": f"msg_fake_{uuid.uuid4().hex[:16]}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "fake"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": len(prompt) // 3 + 1, "output_tokens": len(text) // 3 + 1},
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="가짜 Anthropic Messages API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-median", type=float, default=settings.latency_median)
+    parser.add_argument("--latency-sigma", type=float, default=settings.latency_sigma)
+    parser.add_argument("--rate-429", type=float, default=settings.rate_429)
+    parser.add_argument("--rate-529", type=float, default=settings.rate_529)
+    parser.add_argument("--retry-after", type=float, default=settings.retry_after)
+    parser.add_argument("--sentences", type=int, default=settings.sentences_per_chunk)
+    parser.add_argument("--payload", help="고정 응답으로 쓸 {\"sentences\": [...]} JSON 파일")
+    args = parser.parse_args(argv)
+
+    settings.latency_median = args.latency_median
+    settings.latency_sigma = args.latency_sigma
+    settings.rate_429 = args.rate_429
+    settings.rate_529 = args.rate_529
+    settings.retry_after = args.retry_after
+    settings.sentences_per_chunk = args.sentences
+    if args.payload:
+        with open(args.payload, encoding="utf-8") as f:
+            settings.canned_payload = json.dumps(json.load(f), ensure_ascii=False)
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
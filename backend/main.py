@@ -1,25 +1,60 @@
+import asyncio
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from routers import analyze, translate
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Match
+from routers import admin, analyze, translate, session
 from services.cache import cache
-from config import REDIS_URL
+from services.upstream import scheduler
+from services.admission import admission, AdmissionRejected
+from services.jobs import jobs
+from services.compression import CompressionMiddleware
+from services.metrics import (
+    registry,
+    timed,
+    current_endpoint,
+    request_timings,
+    format_server_timing,
+    HTTP_REQUEST_SECONDS,
+)
+from services.profiling import is_admin, profile_request, make_profile_key
+from services.warmup import prewarm
+from services.dictionary import hot_dictionary
+from config import REDIS_URL, PROFILE_TTL, COMPRESSION_MIN_SIZE, PREWARM
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 시작 시 캐시 초기화
-    await cache.initialize(REDIS_URL)
+    # 시작 시 캐시 초기화 (Redis 연결은 백그라운드, 그동안 메모리 캐시로 처리)
+    await cache.initialize(REDIS_URL, wait=False)
+    await jobs.start(REDIS_URL)
+    hot_dictionary.start()
+    warm_task = asyncio.create_task(prewarm()) if PREWARM else None
     yield
+    if warm_task and not warm_task.done():
+        warm_task.cancel()
+    await hot_dictionary.stop()
+    await jobs.stop()
     # 종료 시 캐시 연결 해제
     await cache.close()
 
 
+class TimedJSONResponse(JSONResponse):
+    """JSON 직렬화 시간을 serialize 단계로 기록하는 기본 응답 클래스"""
+
+    def render(self, content) -> bytes:
+        with timed("serialize"):
+            return super().render(content)
+
+
 app = FastAPI(
     title="Text Heatmap API",
     description="LLM attention 기반 텍스트 중요도 분석 API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
 # CORS 설정
@@ -29,13 +64,93 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-Id", "ETag", "Retry-After"],
 )
 
+# 큰 JSON 응답 압축 (gzip, brotli 설치 시 br)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+
+def _route_path(request: Request) -> str:
+    """메트릭 라벨용 라우트 경로 (매칭되지 않는 경로는 하나로 묶어 라벨 수 폭증 방지)"""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", request.url.path)
+    return "unmatched"
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """요청 메트릭 기록 및 단계별 시간을 Server-Timing 헤더로 반환"""
+    endpoint = _route_path(request)
+    endpoint_token = current_endpoint.set(endpoint)
+    timings_token = request_timings.set({})
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["Server-Timing"] = format_server_timing(
+            request_timings.get(), time.perf_counter() - started
+        )
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, endpoint=endpoint, method=request.method, status=str(status)
+        )
+        request_timings.reset(timings_token)
+        current_endpoint.reset(endpoint_token)
+
+
+@app.middleware("http")
+async def profile_if_requested(request: Request, call_next):
+    """관리자가 X-Profile: 1 (또는 ?profile=1)로 요청하면 해당 요청을 프로파일링"""
+    wants_profile = request.headers.get("x-profile") == "1" or request.query_params.get("profile") == "1"
+    if not wants_profile or not is_admin(request.headers.get("x-admin-token")):
+        return await call_next(request)
+
+    async with profile_request(request.url.path) as session:
+        response = await call_next(request)
+
+    if session is None:
+        response.headers["X-Profile"] = "busy"
+    else:
+        await cache.set(make_profile_key(session.id), session.to_json(), PROFILE_TTL)
+        response.headers["X-Profile-Id"] = session.id
+    return response
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    """입장 거절은 대기 없이 바로 503 (클라이언트는 Retry-After 뒤에 재시도)"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "reason": exc.reason},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # 라우터 등록
 app.include_router(analyze.router, prefix="/api", tags=["analyze"])
 app.include_router(translate.router, prefix="/api", tags=["translate"])
+app.include_router(session.router, prefix="/api", tags=["session"])
+app.include_router(admin.router, prefix="/api", tags=["admin"])
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "cache": cache.backend,
+        "hot_dictionary": {"source": hot_dictionary.source, "words": len(hot_dictionary)},
+        "upstream": scheduler.stats(),
+        "admission": admission.stats(),
+        "jobs": await jobs.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
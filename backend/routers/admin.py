@@ -0,0 +1,19 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header, Response
+from services.cache import cache
+from services.profiling import is_admin, make_profile_key
+
+router = APIRouter()
+
+
+@router.get("/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """저장된 요청 프로파일(CPU/메모리)을 조회합니다."""
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="권한이 없습니다.")
+
+    data = await cache.get(make_profile_key(profile_id))
+    if not data:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+
+    return Response(content=data, media_type="application/json")
@@ -1,27 +1,49 @@
 import json
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from pydantic import BaseModel
-from typing import List, Optional
-from services.extraction import extract_important_parts_single_chunk, split_into_chunks, split_into_words
-from services.file_parser import extract_text
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File
+from pydantic import BaseModel, Field
+from typing import List, Literal
+from services.extraction import split_into_chunks, split_into_words
+from services.scoring import LLMScorer
+from services.jobs import jobs
 from services.cache import cache, CacheService
-from config import MAX_CHARACTERS, MAX_FILE_SIZE_MB, CACHE_TTL_ANALYZE, CACHE_TTL_FILE, HAIKU_MODEL
+from services.upstream import Priority
+from services.analysis import analyze, analysis_http_error
+from services.serialization import dumps, json_response, cached_json_response
+from services.conditional import make_etag, check_not_modified
+from config import (
+    MAX_CHARACTERS,
+    MAX_FILE_SIZE_MB,
+    CACHE_TTL_FILE,
+    HAIKU_MODEL,
+)
 
 router = APIRouter()
 
+# llm: Haiku 분석 (기본), fast: 로컬 추출 요약 (즉시 미리보기용)
+AnalyzeMode = Literal["llm", "fast"]
+
 
 class TextRequest(BaseModel):
     text: str
+    mode: AnalyzeMode = "llm"
 
 
 class ChunkRequest(BaseModel):
     text: str
     chunk_index: int
+    prefetch: bool = False  # 미리 읽기 요청이면 사용자 요청보다 낮은 우선순위로 처리
+    mode: AnalyzeMode = "llm"
+
+
+class UploadCheckRequest(BaseModel):
+    sha256: str = Field(pattern=r"^[0-9a-fA-F]{64}$")  # 파일 내용의 SHA-256 (hex)
+    size: int = Field(ge=0)                             # 파일 크기(바이트)
 
 
 class AnalyzeResponse(BaseModel):
     words: List[str]
     scores: List[float]
+    mode: str = "llm"  # 실제로 점수를 만든 엔진 (LLM 실패 시 fast로 대체될 수 있음)
     cached: bool = False
 
 
@@ -30,6 +52,7 @@ class ChunkAnalyzeResponse(BaseModel):
     scores: List[float]
     chunk_index: int
     total_chunks: int
+    mode: str = "llm"
     cached: bool = False
 
 
@@ -41,7 +64,7 @@ class FileUploadResponse(BaseModel):
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_text(request: TextRequest):
+async def analyze_text(request: TextRequest, http_request: Request):
     """짧은 텍스트를 분석하여 단어별 중요도를 반환합니다."""
     text = request.text.strip()
 
@@ -55,28 +78,25 @@ async def analyze_text(request: TextRequest):
             detail="텍스트가 너무 깁니다. 긴 텍스트는 파일 업로드를 사용해주세요.",
         )
 
-    # 캐시 확인
+    # 클라이언트가 같은 결과를 가지고 있으면 캐시 조회 없이 304
     cache_key = CacheService.make_analyze_key(HAIKU_MODEL, text)
-    cached_result = await cache.get(cache_key)
-    if cached_result:
-        data = json.loads(cached_result)
-        return AnalyzeResponse(words=data["words"], scores=data["scores"], cached=True)
+    not_modified = check_not_modified(http_request, make_etag(cache_key, request.mode))
+    if not_modified:
+        return not_modified
 
     try:
-        words, scores = await extract_important_parts_single_chunk(text)
-    except ValueError as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        serialized, mode, cached = await analyze(text, request.mode, Priority.INTERACTIVE)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
-
-    # 캐시 저장
-    await cache.set(cache_key, json.dumps({"words": words, "scores": scores}), CACHE_TTL_ANALYZE)
+        raise analysis_http_error(e)
 
-    return AnalyzeResponse(words=words, scores=scores, cached=False)
+    # 캐시 적중이면 저장된 JSON을 역직렬화/검증 없이 그대로 반환
+    return cached_json_response(
+        serialized, headers={"ETag": make_etag(cache_key, mode)}, mode=mode, cached=cached
+    )
 
 
 @router.post("/upload", response_model=FileUploadResponse)
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(http_request: Request, file: UploadFile = File(...)):
     """파일을 업로드하여 텍스트를 추출합니다. (분석은 별도 요청)"""
     content = await file.read()
     file_size_mb = len(content) / (1024 * 1024)
@@ -87,20 +107,23 @@ async def upload_file(file: UploadFile = File(...)):
             detail=f"파일이 너무 큽니다. 최대 {MAX_FILE_SIZE_MB}MB까지 가능합니다.",
         )
 
+    # 같은 파일의 추출 결과를 이미 받았으면 본문(전체 텍스트)을 다시 보내지 않음
+    sha256 = CacheService.hash_content(content)
+    cache_key = CacheService.make_file_key_from_hash(sha256)
+    etag = make_etag(cache_key)
+    not_modified = check_not_modified(http_request, etag)
+    if not_modified:
+        return not_modified
+
     # 파일 캐시 확인
-    cache_key = CacheService.make_file_key(content)
     cached_result = await cache.get(cache_key)
     if cached_result:
-        data = json.loads(cached_result)
-        return FileUploadResponse(
-            text=data["text"],
-            total_chunks=data["total_chunks"],
-            total_characters=data["total_characters"],
-            cached=True,
-        )
+        # 확인용 정보가 없는 예전 항목도 다음부터 /upload/check로 찾을 수 있도록
+        await cache.set_file_meta(sha256, len(content), CACHE_TTL_FILE)
+        return cached_json_response(cached_result, headers={"ETag": etag}, cached=True)
 
     try:
-        text = extract_text(file.filename, content)
+        text = await jobs.extract_text(file.filename, content)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -115,23 +138,51 @@ async def upload_file(file: UploadFile = File(...)):
     total_chunks = len(chunks)
     total_characters = len(text)
 
-    # 파일 캐시 저장
+    # 파일 캐시 저장 (본문은 응답 형식 그대로, 해시/크기는 확인용 항목에 따로)
     await cache.set(
         cache_key,
-        json.dumps({"text": text, "total_chunks": total_chunks, "total_characters": total_characters}),
+        dumps({
+            "text": text,
+            "total_chunks": total_chunks,
+            "total_characters": total_characters,
+        }),
         CACHE_TTL_FILE
     )
+    await cache.set_file_meta(sha256, len(content), CACHE_TTL_FILE)
+
+    return json_response({
+        "text": text,
+        "total_chunks": total_chunks,
+        "total_characters": total_characters,
+        "cached": False,
+    }, headers={"ETag": etag})
 
-    return FileUploadResponse(
-        text=text,
-        total_chunks=total_chunks,
-        total_characters=total_characters,
-        cached=False,
-    )
+
+@router.post("/upload/check", response_model=FileUploadResponse)
+async def check_upload(request: UploadCheckRequest, http_request: Request):
+    """파일 해시로 추출 결과가 이미 있는지 확인합니다. (있으면 업로드 없이 바로 응답, 없으면 404)"""
+    if request.size > MAX_FILE_SIZE_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=400,
+            detail=f"파일이 너무 큽니다. 최대 {MAX_FILE_SIZE_MB}MB까지 가능합니다.",
+        )
+
+    cache_key = CacheService.make_file_key_from_hash(request.sha256)
+    etag = make_etag(cache_key)
+    not_modified = check_not_modified(http_request, etag)
+    if not_modified:
+        return not_modified
+
+    # 키는 해시 앞 16자리이므로 전체 해시와 크기가 같은지 먼저 확인
+    cached_result = await cache.get(cache_key) if await cache.has_file(request.sha256, request.size) else None
+    if cached_result:
+        return cached_json_response(cached_result, headers={"ETag": etag}, cached=True)
+
+    raise HTTPException(status_code=404, detail="업로드된 적 없는 파일입니다.")
 
 
 @router.post("/analyze/chunk", response_model=ChunkAnalyzeResponse)
-async def analyze_chunk(request: ChunkRequest):
+async def analyze_chunk(request: ChunkRequest, http_request: Request):
     """특정 청크만 분석합니다."""
     text = request.text.strip()
     chunk_index = request.chunk_index
@@ -149,42 +200,34 @@ async def analyze_chunk(request: ChunkRequest):
         )
 
     chunk_text = chunks[chunk_index]
+    priority = Priority.PREFETCH if request.prefetch else Priority.INTERACTIVE
 
-    # 청크 캐시 확인 (청크 텍스트 기준)
+    # 청크 텍스트 기준 ETag (같은 청크라도 위치/전체 수가 다르면 응답이 다름)
     cache_key = CacheService.make_analyze_key(HAIKU_MODEL, chunk_text)
-    cached_result = await cache.get(cache_key)
-    if cached_result:
-        data = json.loads(cached_result)
-        return ChunkAnalyzeResponse(
-            words=data["words"],
-            scores=data["scores"],
-            chunk_index=chunk_index,
-            total_chunks=total_chunks,
-            cached=True,
-        )
+    not_modified = check_not_modified(
+        http_request, make_etag(cache_key, request.mode, chunk_index, total_chunks)
+    )
+    if not_modified:
+        return not_modified
 
     try:
-        words, scores = await extract_important_parts_single_chunk(chunk_text)
-    except ValueError as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        serialized, mode, cached = await analyze(chunk_text, request.mode, priority)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
+        raise analysis_http_error(e)
 
-    # 청크 캐시 저장
-    await cache.set(cache_key, json.dumps({"words": words, "scores": scores}), CACHE_TTL_ANALYZE)
-
-    return ChunkAnalyzeResponse(
-        words=words,
-        scores=scores,
+    return cached_json_response(
+        serialized,
+        headers={"ETag": make_etag(cache_key, mode, chunk_index, total_chunks)},
         chunk_index=chunk_index,
         total_chunks=total_chunks,
-        cached=False,
+        mode=mode,
+        cached=cached,
     )
 
 
 # 기존 파일 분석 엔드포인트 (하위 호환성)
 @router.post("/analyze/file", response_model=AnalyzeResponse)
-async def analyze_file(file: UploadFile = File(...)):
+async def analyze_file(http_request: Request, file: UploadFile = File(...)):
     """파일을 업로드하여 첫 번째 청크를 분석합니다."""
     content = await file.read()
     file_size_mb = len(content) / (1024 * 1024)
@@ -195,8 +238,14 @@ async def analyze_file(file: UploadFile = File(...)):
             detail=f"파일이 너무 큽니다. 최대 {MAX_FILE_SIZE_MB}MB까지 가능합니다.",
         )
 
+    # 첫 청크 분석 결과는 파일 내용으로 정해지므로 파일 키로 ETag 생성
+    sha256 = CacheService.hash_content(content)
+    file_cache_key = CacheService.make_file_key_from_hash(sha256)
+    not_modified = check_not_modified(http_request, make_etag(file_cache_key, "analyze", LLMScorer.name))
+    if not_modified:
+        return not_modified
+
     # 파일 캐시 확인 (텍스트 추출 결과)
-    file_cache_key = CacheService.make_file_key(content)
     cached_file = await cache.get(file_cache_key)
 
     if cached_file:
@@ -204,7 +253,7 @@ async def analyze_file(file: UploadFile = File(...)):
         text = data["text"]
     else:
         try:
-            text = extract_text(file.filename, content)
+            text = await jobs.extract_text(file.filename, content)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
@@ -219,29 +268,27 @@ async def analyze_file(file: UploadFile = File(...)):
         chunks = split_into_chunks(text)
         await cache.set(
             file_cache_key,
-            json.dumps({"text": text, "total_chunks": len(chunks), "total_characters": len(text)}),
+            dumps({
+                "text": text,
+                "total_chunks": len(chunks),
+                "total_characters": len(text),
+            }),
             CACHE_TTL_FILE
         )
+        await cache.set_file_meta(sha256, len(content), CACHE_TTL_FILE)
 
     # 첫 번째 청크만 분석
     chunks = split_into_chunks(text)
     first_chunk = chunks[0] if chunks else text
 
-    # 분석 캐시 확인
-    analyze_cache_key = CacheService.make_analyze_key(HAIKU_MODEL, first_chunk)
-    cached_analyze = await cache.get(analyze_cache_key)
-    if cached_analyze:
-        data = json.loads(cached_analyze)
-        return AnalyzeResponse(words=data["words"], scores=data["scores"], cached=True)
-
     try:
-        words, scores = await extract_important_parts_single_chunk(first_chunk)
-    except ValueError as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        serialized, mode, cached = await analyze(first_chunk, LLMScorer.name, Priority.INTERACTIVE)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(e)}")
+        raise analysis_http_error(e)
 
-    # 분석 캐시 저장
-    await cache.set(analyze_cache_key, json.dumps({"words": words, "scores": scores}), CACHE_TTL_ANALYZE)
-
-    return AnalyzeResponse(words=words, scores=scores, cached=False)
+    return cached_json_response(
+        serialized,
+        headers={"ETag": make_etag(file_cache_key, "analyze", mode)},
+        mode=mode,
+        cached=cached,
+    )
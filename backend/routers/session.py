@@ -0,0 +1,244 @@
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, ValidationError
+from config import WS_MAX_INFLIGHT, WS_PREFETCH_CHUNKS
+from routers.analyze import AnalyzeMode
+from routers.translate import WordTranslateRequest, SentenceTranslateRequest, ParagraphTranslateRequest
+from services.admission import AdmissionRejected
+from services.analysis import analyze, analysis_http_error
+from services.dictionary import hot_dictionary
+from services.extraction import split_into_chunks
+from services.metrics import current_endpoint, WS_CONNECTIONS, WS_MESSAGES
+from services.serialization import dumps, patch_json_object
+from services.translation import translate, translation_key, translation_http_error
+from services.upstream import Priority
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class DocumentMessage(BaseModel):
+    text: str
+
+
+class ChunkMessage(BaseModel):
+    chunk_index: int
+    prefetch: bool = False
+    mode: AnalyzeMode = "llm"
+
+
+class ReadingSession:
+    """WebSocket 연결 하나에 묶인 읽기 세션.
+
+    클라이언트 → 서버 (모두 JSON, id는 응답과 짝을 맞추는 클라이언트 태그):
+        {"id": 1, "type": "document", "text": "..."}              전체 텍스트 (청크 분할은 한 번만)
+        {"id": 2, "type": "analyze_chunk", "chunk_index": 0}      HTTP /api/analyze/chunk와 같은 필드
+        {"id": 3, "type": "translate_word", "word": "..."}        translate_sentence / translate_paragraph도 동일
+    서버 → 클라이언트:
+        요청마다 같은 id/type으로 응답하며, 끝나는 순서대로 보낸다 (요청 순서와 다를 수 있음).
+        오류는 {"id", "type": "error", "status", "detail"} (503이면 retry_after 포함).
+        청크 분석 요청 뒤에는 다음 청크를 미리 읽기 우선순위로 분석해 id 없이
+        {"type": "chunk", "pushed": true, ...청크 필드} 로 먼저 보낸다.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self._ws = websocket
+        # 보낼 프레임 대기열. 가득 차면 요청 태스크가 put에서 기다리며 슬롯을 쥐고 있으므로
+        # 읽지 않는 클라이언트에게는 더 이상 메시지를 받지 않는다 (서버 버퍼가 무한히 늘지 않음)
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=WS_MAX_INFLIGHT)
+        self._tasks: Set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(WS_MAX_INFLIGHT)
+        self._chunks: List[str] = []
+        self._requested: Set[int] = set()  # 보냈거나 분석 중인 청크 (같은 청크를 두 번 push하지 않음)
+        self._handlers: Dict[str, Callable[[dict], Awaitable[str]]] = {
+            "document": self._document,
+            "analyze_chunk": self._analyze_chunk,
+            "translate_word": self._translator("word", WordTranslateRequest, "word", "단어가 비어있습니다."),
+            "translate_sentence": self._translator(
+                "sentence", SentenceTranslateRequest, "sentence", "문장이 비어있습니다."
+            ),
+            "translate_paragraph": self._translator(
+                "paragraph", ParagraphTranslateRequest, "paragraph", "문단이 비어있습니다."
+            ),
+        }
+
+    async def run(self):
+        writer = asyncio.create_task(self._write())
+        try:
+            while True:
+                # receive_text는 바이너리 프레임에서 KeyError가 나므로 직접 받아서 구분
+                message = await self._ws.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                # 처리 중인 요청이 많으면 다음 메시지를 읽지 않고 기다림
+                await self._slots.acquire()
+                self._spawn(self._handle(message.get("text")), counted=True)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            writer.cancel()
+
+    def _spawn(self, coroutine, counted: bool = False):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+
+        def done(finished: asyncio.Task):
+            self._tasks.discard(finished)
+            if counted:
+                self._slots.release()
+
+        task.add_done_callback(done)
+
+    async def _write(self):
+        """보내기는 이 태스크 하나만 (여러 요청 태스크가 동시에 send하지 않도록)"""
+        while True:
+            await self._ws.send_text(await self._outbox.get())
+
+    async def _handle(self, raw: Optional[str]):
+        request_id = None
+        message_type = "unknown"
+        result = "ok"
+        try:
+            if raw is None:
+                raise HTTPException(status_code=400, detail="바이너리 프레임은 지원하지 않습니다. JSON 텍스트로 보내주세요.")
+            message = json.loads(raw)
+            if not isinstance(message, dict):
+                raise HTTPException(status_code=400, detail="JSON 객체가 아닙니다.")
+            request_id = message.get("id")
+            message_type = str(message.get("type"))
+            handler = self._handlers.get(message_type)
+            if handler is None:
+                raise HTTPException(status_code=400, detail=f"알 수 없는 요청 종류입니다: {message_type}")
+            frame = await handler(message)
+        except asyncio.CancelledError:
+            raise
+        except ValueError as e:
+            # json.JSONDecodeError, pydantic ValidationError 모두 ValueError
+            status = 422 if isinstance(e, ValidationError) else 400
+            frame = self._error_frame(request_id, HTTPException(status_code=status, detail=str(e)))
+            result = "error"
+        except Exception as e:
+            frame = self._error_frame(request_id, e)
+            result = "error"
+
+        WS_MESSAGES.inc(type=message_type if message_type in self._handlers else "unknown", result=result)
+        await self._outbox.put(frame)
+
+    @staticmethod
+    def _error_frame(request_id, error: Exception) -> str:
+        if isinstance(error, AdmissionRejected):
+            return dumps({
+                "type": "error", "id": request_id, "status": 503,
+                "detail": str(error), "retry_after": error.retry_after,
+            })
+        if not isinstance(error, HTTPException):
+            logger.exception("세션 요청 처리 실패", exc_info=error)
+            error = HTTPException(status_code=500, detail=str(error))
+        return dumps({"type": "error", "id": request_id, "status": error.status_code, "detail": error.detail})
+
+    async def _document(self, message: dict) -> str:
+        text = DocumentMessage(**message).text.strip()
+        if not text:
+            raise HTTPException(status_code=400, detail="텍스트가 비어있습니다.")
+
+        # 청크 분할은 문서마다 한 번 (HTTP는 청크 요청마다 전체 텍스트를 다시 분할)
+        self._chunks = await asyncio.to_thread(split_into_chunks, text)
+        self._requested = set()
+        return dumps({
+            "id": message.get("id"),
+            "type": "document",
+            "total_chunks": len(self._chunks),
+            "total_characters": len(text),
+        })
+
+    async def _analyze_chunk(self, message: dict) -> str:
+        request = ChunkMessage(**message)
+        # 처리 중에 새 문서가 오면 self._chunks/_requested가 바뀌므로 요청 시점의 것만 사용
+        chunks, requested = self._chunks, self._requested
+        if not chunks:
+            raise HTTPException(status_code=400, detail="문서를 먼저 보내주세요. (type: document)")
+        if request.chunk_index < 0 or request.chunk_index >= len(chunks):
+            raise HTTPException(status_code=400, detail=f"잘못된 청크 인덱스입니다. (0-{len(chunks) - 1})")
+
+        requested.add(request.chunk_index)
+        priority = Priority.PREFETCH if request.prefetch else Priority.INTERACTIVE
+        try:
+            serialized, mode, cached = await analyze(chunks[request.chunk_index], request.mode, priority)
+        except Exception as e:
+            requested.discard(request.chunk_index)
+            raise analysis_http_error(e)
+
+        # 다음 청크는 요청을 기다리지 않고 미리 분석해서 보냄
+        for index in range(request.chunk_index + 1, min(len(chunks), request.chunk_index + 1 + WS_PREFETCH_CHUNKS)):
+            if index not in requested:
+                requested.add(index)
+                self._spawn(self._push_chunk(chunks, requested, index, request.mode))
+
+        return self._chunk_frame(
+            serialized, chunks, request.chunk_index, mode, cached, id=message.get("id"), type="analyze_chunk"
+        )
+
+    async def _push_chunk(self, chunks: List[str], requested: Set[int], index: int, mode: str):
+        try:
+            serialized, used, cached = await analyze(chunks[index], mode, Priority.PREFETCH)
+        except Exception as e:
+            # 미리 읽기는 실패해도 알리지 않음 (클라이언트가 요청하면 다시 분석)
+            logger.info(f"청크 {index} 미리 분석 생략 ({e})")
+            requested.discard(index)
+            return
+
+        if chunks is self._chunks:  # 그사이 문서가 바뀌지 않았을 때만
+            WS_MESSAGES.inc(type="chunk", result="pushed")
+            await self._outbox.put(self._chunk_frame(serialized, chunks, index, used, cached, type="chunk", pushed=True))
+
+    @staticmethod
+    def _chunk_frame(serialized: str, chunks: List[str], index: int, mode: str, cached: bool, **fields) -> str:
+        # 캐시에 저장된 words/scores JSON에 필드만 덧붙임 (역직렬화 없음)
+        return patch_json_object(
+            serialized,
+            **fields,
+            chunk_index=index,
+            total_chunks=len(chunks),
+            mode=mode,
+            cached=cached,
+        ).decode("utf-8")
+
+    def _translator(self, kind: str, model, field: str, empty_detail: str) -> Callable[[dict], Awaitable[str]]:
+        async def handle(message: dict) -> str:
+            original = getattr(model(**message), field).strip()
+            if not original:
+                raise HTTPException(status_code=400, detail=empty_detail)
+
+            cache_key, source = translation_key(kind, original)
+            if kind == "word":
+                hot_dictionary.record(source)
+            try:
+                translation, cached = await translate(kind, source, cache_key)
+            except Exception as e:
+                raise translation_http_error(e)
+            return dumps({
+                "id": message.get("id"),
+                "type": f"translate_{kind}",
+                "original": original,
+                "translation": translation,
+                "cached": cached,
+            })
+        return handle
+
+
+@router.websocket("/ws")
+async def reading_session(websocket: WebSocket):
+    """읽기 세션 WebSocket (청크 분석/번역 요청을 한 연결로 주고받음)"""
+    await websocket.accept()
+    current_endpoint.set("/api/ws")
+    WS_CONNECTIONS.inc()
+    try:
+        await ReadingSession(websocket).run()
+    finally:
+        WS_CONNECTIONS.dec()
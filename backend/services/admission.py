@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict
+from config import (
+    ADMISSION_ANALYZE_CONCURRENCY,
+    ADMISSION_ANALYZE_QUEUE,
+    ADMISSION_ANALYZE_TIMEOUT,
+    ADMISSION_TRANSLATE_CONCURRENCY,
+    ADMISSION_TRANSLATE_QUEUE,
+    ADMISSION_TRANSLATE_TIMEOUT,
+)
+from services.metrics import timed, ADMISSION_INFLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTIONS
+from services.upstream import Priority
+
+logger = logging.getLogger(__name__)
+
+SERVICE_TIME_ALPHA = 0.2  # 처리 시간 이동 평균 가중치
+RETRY_AFTER_MAX = 60      # Retry-After 상한(초)
+
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 찼거나 제한 시간 안에 처리할 수 없어 거절된 요청 (503 + Retry-After)"""
+
+    def __init__(self, route_class: str, reason: str, retry_after: int):
+        super().__init__(f"요청이 많아 지금은 처리할 수 없습니다. {retry_after}초 후 다시 시도해주세요.")
+        self.route_class = route_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionQueue:
+    """경로 종류별 입장 제어 (동시 처리 수 + 길이 제한 대기열 + 대기 시간 제한).
+
+    - 빈 자리가 있으면 바로 입장, 없으면 FIFO 대기열에서 기다림
+    - 대기열이 가득 찼거나 예상 대기 시간이 제한을 넘으면 기다리지 않고 바로 거절
+    - 제한 시간 안에 자리를 받지 못하면 거절
+    - 미리 읽기 등 낮은 우선순위 요청은 대기열 절반까지만 사용
+    max_concurrency가 0 이하면 제한 없음.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self._max_concurrency = max_concurrency
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._service_time = 0.0  # 입장 후 처리 시간 이동 평균(초), 0이면 아직 표본 없음
+        self._admitted = 0
+        self._rejected: Counter = Counter()
+        self._update_gauges()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_concurrency > 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def estimated_wait(self, ahead: int) -> float:
+        """앞에 ahead개가 기다릴 때 자리를 받기까지 예상 시간(초). 표본이 없으면 0"""
+        return (ahead // self._max_concurrency + 1) * self._service_time
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE):
+        """자리를 받아 블록을 실행합니다. 받지 못하면 AdmissionRejected."""
+        if not self.enabled:
+            yield
+            return
+
+        await self._enter(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self._service_time = (
+                elapsed if not self._service_time
+                else self._service_time + SERVICE_TIME_ALPHA * (elapsed - self._service_time)
+            )
+            self._leave()
+
+    async def _enter(self, priority: Priority):
+        if self._active < self._max_concurrency and not self._waiters:
+            self._active += 1
+            self._admitted += 1
+            self._update_gauges()
+            return
+
+        ahead = len(self._waiters)
+        limit = self._max_queue if priority == Priority.INTERACTIVE else self._max_queue // 2
+        if ahead >= limit:
+            self._reject("queue_full", ahead)
+        if self.estimated_wait(ahead) > self._queue_timeout:
+            self._reject("estimated_wait", ahead)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self._update_gauges()
+        try:
+            with timed("queue"):
+                await asyncio.wait_for(future, self._queue_timeout)
+        except asyncio.TimeoutError:
+            # 시간 초과와 동시에 자리를 받았으면 그대로 진행
+            if not (future.done() and not future.cancelled()):
+                self._discard(future)
+                self._reject("timeout", len(self._waiters))
+        except asyncio.CancelledError:
+            # 클라이언트 연결 종료 등으로 취소: 이미 받은 자리는 반납
+            if future.done() and not future.cancelled():
+                self._leave()
+            else:
+                self._discard(future)
+            raise
+        self._admitted += 1
+
+    def _leave(self):
+        """자리를 다음 대기자에게 넘기고, 대기자가 없으면 반납"""
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                self._update_gauges()
+                return
+        self._active -= 1
+        self._update_gauges()
+
+    def _discard(self, future: asyncio.Future):
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+        self._update_gauges()
+
+    def _reject(self, reason: str, ahead: int):
+        self._rejected[reason] += 1
+        ADMISSION_REJECTIONS.inc(route_class=self.name, reason=reason)
+        wait = self.estimated_wait(ahead) or self._queue_timeout
+        retry_after = max(1, min(RETRY_AFTER_MAX, math.ceil(wait)))
+        logger.warning(f"요청 거절 ({self.name}, {reason}, 대기 {ahead}개, Retry-After {retry_after}초)")
+        raise AdmissionRejected(self.name, reason, retry_after)
+
+    def _update_gauges(self):
+        ADMISSION_INFLIGHT.set(self._active, route_class=self.name)
+        ADMISSION_QUEUE_DEPTH.set(len(self._waiters), route_class=self.name)
+
+    def stats(self) -> dict:
+        return {
+            "inflight": self._active,
+            "queue_depth": self.queue_depth,
+            "max_concurrency": self._max_concurrency,
+            "max_queue": self._max_queue,
+            "queue_timeout": self._queue_timeout,
+            "service_seconds": round(self._service_time, 3),
+            "admitted": self._admitted,
+            "rejected": dict(self._rejected),
+        }
+
+
+class AdmissionController:
+    """업스트림(Haiku)을 호출하는 요청의 경로 종류별 입장 제어.
+
+    캐시 적중 응답은 대기열을 거치지 않도록, 핸들러가 캐시 확인 뒤 모델 호출 직전에 slot()으로 감싼다.
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, AdmissionQueue] = {
+            "analyze": AdmissionQueue(
+                "analyze", ADMISSION_ANALYZE_CONCURRENCY, ADMISSION_ANALYZE_QUEUE, ADMISSION_ANALYZE_TIMEOUT
+            ),
+            "translate": AdmissionQueue(
+                "translate", ADMISSION_TRANSLATE_CONCURRENCY, ADMISSION_TRANSLATE_QUEUE, ADMISSION_TRANSLATE_TIMEOUT
+            ),
+        }
+
+    def slot(self, route_class: str, priority: Priority = Priority.INTERACTIVE):
+        return self._queues[route_class].slot(priority)
+
+    def stats(self) -> dict:
+        return {name: queue.stats() for name, queue in self._queues.items()}
+
+
+# 싱글톤 인스턴스
+admission = AdmissionController()
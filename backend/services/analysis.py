@@ -0,0 +1,81 @@
+import logging
+from contextlib import nullcontext
+from typing import Awaitable, Callable, List, Optional, Tuple
+from fastapi import HTTPException
+from config import CACHE_TTL_ANALYZE, CACHE_STALE_TTL, HAIKU_MODEL, SCORER_FALLBACK
+from services.admission import admission, AdmissionRejected
+from services.cache import cache, CacheService
+from services.scoring import get_scorer, LLMScorer, FastScorer
+from services.serialization import dumps
+from services.upstream import Priority, UpstreamTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+async def score(text: str, mode: str, priority: Priority) -> Tuple[List[str], List[float], str]:
+    """mode에 맞는 엔진으로 분석합니다. LLM이 실패하면 설정에 따라 빠른 점수로 대체.
+
+    제한 시간 초과는 대체하지 않고 그대로 올림 (이미 호출 제한 시간을 다 써서 504로 응답).
+    """
+    scorer = get_scorer(mode)
+    try:
+        words, scores = await scorer.score(text, priority)
+        return words, scores, scorer.name
+    except UpstreamTimeoutError:
+        raise
+    except Exception as e:
+        if scorer.name == FastScorer.name or not SCORER_FALLBACK:
+            raise
+        logger.warning(f"LLM 분석 실패 ({e}), 빠른 점수로 대체")
+        fallback = get_scorer(FastScorer.name)
+        words, scores = await fallback.score(text, priority)
+        return words, scores, fallback.name
+
+
+def _admission(mode: str, priority: Priority):
+    """LLM 분석만 입장 제어 (fast는 업스트림을 호출하지 않음)"""
+    if mode == LLMScorer.name:
+        return admission.slot("analyze", priority)
+    return nullcontext()
+
+
+def _refresh_analysis(text: str) -> Callable[[], Awaitable[Optional[str]]]:
+    """만료된 분석 캐시 갱신용 (미리 읽기 우선순위, LLM 결과만 저장)"""
+    async def refresh() -> Optional[str]:
+        words, scores = await get_scorer(LLMScorer.name).score(text, Priority.PREFETCH)
+        return dumps({"words": words, "scores": scores})
+    return refresh
+
+
+async def analyze(text: str, mode: str, priority: Priority) -> Tuple[str, str, bool]:
+    """텍스트(청크) 분석 결과를 (words/scores JSON 문자열, 실제 엔진, 캐시 적중)으로 반환합니다.
+
+    캐시 확인 → (캐시에 없을 때만) 입장 제어 → 분석 → LLM 결과 캐시 저장.
+    JSON 문자열은 캐시 값 그대로이므로 응답에 필드만 덧붙여 쓴다. HTTP/WebSocket 공용.
+    """
+    cache_key = CacheService.make_analyze_key(HAIKU_MODEL, text)
+
+    # 캐시 확인 (만료된 값은 바로 반환하고 백그라운드에서 갱신)
+    cached_result = await cache.get_or_refresh(cache_key, CACHE_TTL_ANALYZE, _refresh_analysis(text))
+    if cached_result:
+        return cached_result, LLMScorer.name, True
+
+    async with _admission(mode, priority):
+        words, scores, used = await score(text, mode, priority)
+
+    serialized = dumps({"words": words, "scores": scores})
+    # 캐시 저장 (LLM 결과만)
+    if used == LLMScorer.name:
+        await cache.set(cache_key, serialized, CACHE_TTL_ANALYZE, CACHE_STALE_TTL)
+    return serialized, used, False
+
+
+def analysis_http_error(error: Exception) -> Exception:
+    """분석 오류를 HTTP 오류로 바꿉니다. (입장 거절은 503 처리기로 그대로 전달)"""
+    if isinstance(error, (HTTPException, AdmissionRejected)):
+        return error
+    if isinstance(error, UpstreamTimeoutError):
+        return HTTPException(status_code=504, detail=str(error))
+    if isinstance(error, ValueError):
+        return HTTPException(status_code=500, detail=str(error))
+    return HTTPException(status_code=500, detail=f"분석 중 오류가 발생했습니다: {str(error)}")
@@ -1,12 +1,22 @@
 import hashlib
 import json
 import logging
-from typing import Optional, Any
-from collections import OrderedDict
+import math
+import random
+import time
+from typing import Optional, Any, Tuple, Dict, List, Callable, Awaitable
+from collections import OrderedDict, Counter
 import asyncio
+from config import CACHE_STALE_TTL, CACHE_EARLY_REFRESH_BETA
+from services.metrics import timed, cache_namespace, CACHE_REQUESTS, CACHE_REFRESHES
 
 logger = logging.getLogger(__name__)
 
+# 갱신 1회에 걸리는 시간 추정의 초기값(초). 조기 갱신 확률 계산에 사용
+REFRESH_DEFAULT_SECONDS = 5.0
+# 여러 인스턴스가 같은 키를 동시에 갱신하지 않도록 잡는 Redis 잠금 유지 시간(초)
+REFRESH_LOCK_SECONDS = 120
+
 
 class MemoryCache:
     """LRU 메모리 캐시 (Redis 폴백용)"""
@@ -16,23 +26,26 @@ class MemoryCache:
         self._max_size = max_size
 
     def get(self, key: str) -> Optional[str]:
+        return self.get_with_ttl(key)[0]
+
+    def get_with_ttl(self, key: str) -> Tuple[Optional[str], float]:
+        """(값, 남은 TTL 초) 반환. 만료 시간이 없으면 남은 TTL은 -1"""
         if key not in self._cache:
-            return None
+            return None, -1
 
         value, expire_at = self._cache[key]
 
         # TTL 체크
-        import time
-        if expire_at and time.time() > expire_at:
+        now = time.time()
+        if expire_at and now > expire_at:
             del self._cache[key]
-            return None
+            return None, -1
 
         # LRU: 최근 사용으로 이동
         self._cache.move_to_end(key)
-        return value
+        return value, (expire_at - now if expire_at else -1)
 
     def set(self, key: str, value: str, ttl: int = 0):
-        import time
         expire_at = time.time() + ttl if ttl > 0 else 0
 
         # 이미 존재하면 삭제 후 재삽입 (순서 갱신)
@@ -63,16 +76,38 @@ class CacheService:
         self._memory_cache = MemoryCache(max_size=1000)
         self._use_redis = False
         self._redis_url = None
-
-    async def initialize(self, redis_url: str):
-        """Redis 연결 시도. 실패 시 메모리 캐시 사용."""
+        self._connect_task: Optional[asyncio.Task] = None
+        # stale-while-revalidate: 진행 중인 갱신 작업과 네임스페이스별 갱신 소요 시간(EWMA)
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._refresh_seconds: Dict[str, float] = {}
+        # Redis가 없을 때 쓰는 빈도 집계 (sorted set 대체)
+        self._memory_scores: Dict[str, Counter] = {}
+
+    async def initialize(self, redis_url: str, wait: bool = True):
+        """Redis 연결 시도. 실패 시 메모리 캐시 사용.
+
+        wait=False면 연결을 백그라운드에서 진행하고 바로 반환한다.
+        연결이 끝나기 전까지는 메모리 캐시로 요청을 처리한다.
+        """
         self._redis_url = redis_url
 
+        if wait:
+            await self._connect(redis_url)
+        else:
+            self._connect_task = asyncio.create_task(self._connect(redis_url))
+
+    async def wait_ready(self):
+        """백그라운드 Redis 연결 시도가 끝날 때까지 대기 (성공 여부와 무관)"""
+        if self._connect_task and not self._connect_task.done():
+            await asyncio.shield(self._connect_task)
+
+    async def _connect(self, redis_url: str):
         try:
             import redis.asyncio as redis
-            self._redis = redis.from_url(redis_url, decode_responses=True)
+            client = redis.from_url(redis_url, decode_responses=True)
             # 연결 테스트
-            await self._redis.ping()
+            await client.ping()
+            self._redis = client
             self._use_redis = True
             logger.info(f"Redis 연결 성공: {redis_url}")
         except ImportError:
@@ -85,6 +120,13 @@ class CacheService:
 
     async def get(self, key: str) -> Optional[str]:
         """캐시에서 값 조회"""
+        with timed("cache"):
+            value, tier = await self._get(key)
+        CACHE_REQUESTS.inc(namespace=cache_namespace(key), tier=tier, result="hit" if value else "miss")
+        return value
+
+    async def _get(self, key: str) -> Tuple[Optional[str], str]:
+        """(값, 조회한 저장소) 반환"""
         if self._use_redis and self._redis:
             try:
                 value = await self._redis.get(key)
@@ -92,7 +134,7 @@ class CacheService:
                     logger.debug(f"Cache HIT (Redis): {key}")
                 else:
                     logger.debug(f"Cache MISS (Redis): {key}")
-                return value
+                return value, "redis"
             except Exception as e:
                 logger.warning(f"Redis get 실패 ({e}), 메모리 캐시로 폴백")
                 self._use_redis = False
@@ -103,10 +145,132 @@ class CacheService:
             logger.debug(f"Cache HIT (Memory): {key}")
         else:
             logger.debug(f"Cache MISS (Memory): {key}")
+        return value, "memory"
+
+    async def _get_with_ttl(self, key: str) -> Tuple[Optional[str], float, str]:
+        """(값, 남은 TTL 초, 조회한 저장소) 반환. 남은 TTL이 없으면 -1"""
+        if self._use_redis and self._redis:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.ttl(key)
+                    value, remaining = await pipe.execute()
+                return value, (remaining if value and remaining >= 0 else -1), "redis"
+            except Exception as e:
+                logger.warning(f"Redis get 실패 ({e}), 메모리 캐시로 폴백")
+                self._use_redis = False
+
+        value, remaining = self._memory_cache.get_with_ttl(key)
+        return value, remaining, "memory"
+
+    async def get_or_refresh(
+        self,
+        key: str,
+        ttl: int,
+        refresh: Callable[[], Awaitable[Optional[str]]],
+        stale_ttl: int = CACHE_STALE_TTL,
+    ) -> Optional[str]:
+        """stale-while-revalidate 조회.
+
+        set(key, value, ttl, stale_ttl)로 저장한 항목은 ttl(soft)이 지나도 ttl + stale_ttl(hard)까지
+        남아 있다. soft TTL이 지난 값은 그대로 반환하고 refresh()로 한 번만 백그라운드 갱신한다.
+        soft TTL 직전에는 XFetch 방식으로 확률적으로 미리 갱신하여, 자주 읽히는 키일수록
+        만료 전에 갱신된다. refresh()가 None을 돌려주면 저장하지 않는다.
+        """
+        with timed("cache"):
+            value, remaining, tier = await self._get_with_ttl(key)
+
+        result = "hit" if value else "miss"
+        if value and remaining >= 0:
+            fresh_left = remaining - stale_ttl
+            if fresh_left <= 0:
+                result = "stale"
+                self._schedule_refresh(key, ttl, stale_ttl, refresh, "stale")
+            elif self._should_refresh_early(key, fresh_left):
+                self._schedule_refresh(key, ttl, stale_ttl, refresh, "early")
+
+        CACHE_REQUESTS.inc(namespace=cache_namespace(key), tier=tier, result=result)
         return value
 
-    async def set(self, key: str, value: str, ttl: int = 0):
-        """캐시에 값 저장"""
+    def _should_refresh_early(self, key: str, fresh_left: float) -> bool:
+        """XFetch: 갱신 소요 시간 * beta * -ln(U) 가 남은 soft TTL 이상이면 미리 갱신"""
+        if CACHE_EARLY_REFRESH_BETA <= 0:
+            return False
+        delta = self._refresh_seconds.get(cache_namespace(key), REFRESH_DEFAULT_SECONDS)
+        return delta * CACHE_EARLY_REFRESH_BETA * -math.log(1.0 - random.random()) >= fresh_left
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        ttl: int,
+        stale_ttl: int,
+        refresh: Callable[[], Awaitable[Optional[str]]],
+        reason: str,
+    ):
+        if key in self._refreshing:
+            CACHE_REFRESHES.inc(namespace=cache_namespace(key), reason=reason, result="skipped")
+            return
+        task = asyncio.create_task(self._refresh(key, ttl, stale_ttl, refresh, reason))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(
+        self,
+        key: str,
+        ttl: int,
+        stale_ttl: int,
+        refresh: Callable[[], Awaitable[Optional[str]]],
+        reason: str,
+    ):
+        namespace = cache_namespace(key)
+        lock_key = f"refresh-lock:{key}"
+        if not await self._acquire_refresh_lock(lock_key):
+            # 다른 인스턴스가 갱신 중
+            CACHE_REFRESHES.inc(namespace=namespace, reason=reason, result="skipped")
+            return
+
+        started = time.monotonic()
+        try:
+            value = await refresh()
+            if value is not None:
+                await self.set(key, value, ttl, stale_ttl)
+            elapsed = time.monotonic() - started
+            previous = self._refresh_seconds.get(namespace, elapsed)
+            self._refresh_seconds[namespace] = 0.8 * previous + 0.2 * elapsed
+            CACHE_REFRESHES.inc(namespace=namespace, reason=reason, result="ok")
+            logger.debug(f"Cache REFRESH ({reason}): {key}, {elapsed:.2f}s")
+        except Exception as e:
+            CACHE_REFRESHES.inc(namespace=namespace, reason=reason, result="error")
+            logger.warning(f"캐시 갱신 실패 ({key}): {e}")
+        finally:
+            await self._release_refresh_lock(lock_key)
+
+    async def _acquire_refresh_lock(self, lock_key: str) -> bool:
+        if self._use_redis and self._redis:
+            try:
+                return bool(await self._redis.set(lock_key, "1", nx=True, ex=REFRESH_LOCK_SECONDS))
+            except Exception as e:
+                logger.warning(f"Redis 갱신 잠금 실패 ({e})")
+        return True
+
+    async def _release_refresh_lock(self, lock_key: str):
+        if self._use_redis and self._redis:
+            try:
+                await self._redis.delete(lock_key)
+            except Exception:
+                pass
+
+    async def set(self, key: str, value: str, ttl: int = 0, stale_ttl: int = 0):
+        """캐시에 값 저장
+
+        stale_ttl: soft TTL(ttl)이 지난 뒤에도 get_or_refresh가 오래된 값을 돌려줄 수 있는 시간(초)
+        """
+        if ttl > 0:
+            ttl += stale_ttl
+        with timed("cache_set"):
+            await self._set(key, value, ttl)
+
+    async def _set(self, key: str, value: str, ttl: int = 0):
         if self._use_redis and self._redis:
             try:
                 if ttl > 0:
@@ -123,6 +287,52 @@ class CacheService:
         self._memory_cache.set(key, value, ttl)
         logger.debug(f"Cache SET (Memory): {key}, TTL: {ttl}s")
 
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """여러 키를 한 번에 조회 (Redis MGET). 메트릭에는 기록하지 않음"""
+        if not keys:
+            return []
+        if self._use_redis and self._redis:
+            try:
+                return await self._redis.mget(keys)
+            except Exception as e:
+                logger.warning(f"Redis mget 실패 ({e}), 메모리 캐시로 폴백")
+                self._use_redis = False
+        return [self._memory_cache.get(key) for key in keys]
+
+    async def incr_scores(self, key: str, counts: Dict[str, float], max_members: Optional[int] = None):
+        """sorted set 멤버 점수 증가 (Redis ZINCRBY를 파이프라인으로)
+
+        max_members가 있으면 점수 상위 max_members개만 남기고 나머지는 삭제.
+        """
+        if not counts:
+            return
+        if self._use_redis and self._redis:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for member, amount in counts.items():
+                        pipe.zincrby(key, amount, member)
+                    if max_members is not None:
+                        pipe.zremrangebyrank(key, 0, -(max_members + 1))
+                    await pipe.execute()
+                return
+            except Exception as e:
+                logger.warning(f"Redis zincrby 실패 ({e}), 메모리로 폴백")
+                self._use_redis = False
+        scores = self._memory_scores.setdefault(key, Counter())
+        scores.update(counts)
+        if max_members is not None and len(scores) > max_members:
+            self._memory_scores[key] = Counter(dict(scores.most_common(max_members)))
+
+    async def top_members(self, key: str, limit: int) -> List[str]:
+        """점수가 높은 순으로 sorted set 멤버 반환"""
+        if self._use_redis and self._redis:
+            try:
+                return await self._redis.zrevrange(key, 0, limit - 1)
+            except Exception as e:
+                logger.warning(f"Redis zrevrange 실패 ({e}), 메모리로 폴백")
+                self._use_redis = False
+        return [member for member, _ in self._memory_scores.get(key, Counter()).most_common(limit)]
+
     async def delete(self, key: str) -> bool:
         """캐시에서 값 삭제"""
         if self._use_redis and self._redis:
@@ -137,6 +347,10 @@ class CacheService:
 
     async def close(self):
         """연결 종료"""
+        if self._connect_task and not self._connect_task.done():
+            self._connect_task.cancel()
+        for task in list(self._refreshing.values()):
+            task.cancel()
         if self._redis:
             await self._redis.close()
 
@@ -157,16 +371,56 @@ class CacheService:
         text_hash = CacheService.hash_text(text)
         return f"analyze:{model}:{text_hash}"
 
+    @staticmethod
+    def hash_content(content: bytes) -> str:
+        """파일 내용의 SHA-256 (hex 64자리 전체)"""
+        return hashlib.sha256(content).hexdigest()
+
     @staticmethod
     def make_file_key(content: bytes) -> str:
         """파일 캐시 키 생성"""
-        file_hash = hashlib.sha256(content).hexdigest()[:16]
-        return f"file:{file_hash}"
+        return CacheService.make_file_key_from_hash(CacheService.hash_content(content))
+
+    @staticmethod
+    def make_file_key_from_hash(sha256_hex: str) -> str:
+        """클라이언트가 계산한 SHA-256(hex)으로 파일 캐시 키 생성 (make_file_key와 같은 키)"""
+        return f"file:{sha256_hex.lower()[:16]}"
+
+    @staticmethod
+    def make_file_meta_key(sha256_hex: str) -> str:
+        """파일 캐시 항목의 확인용 정보 키 (전체 해시/크기, 응답 본문과 따로 저장)"""
+        return f"file-meta:{sha256_hex.lower()[:16]}"
+
+    async def set_file_meta(self, sha256_hex: str, size: int, ttl: int):
+        """파일 추출 결과를 저장할 때 원본 파일의 전체 SHA-256과 크기를 함께 기록"""
+        meta = json.dumps({"sha256": sha256_hex.lower(), "size": size})
+        await self.set(self.make_file_meta_key(sha256_hex), meta, ttl)
+
+    async def has_file(self, sha256_hex: str, size: int) -> bool:
+        """전체 SHA-256과 크기가 모두 같은 파일의 추출 결과가 있는지 확인합니다.
+
+        캐시 키는 해시 앞 16자리이므로 키만으로는 같은 파일이라고 볼 수 없다.
+        본문(추출 텍스트)은 읽지 않고 작은 확인용 항목만 비교한다.
+        """
+        meta = await self.get(self.make_file_meta_key(sha256_hex))
+        if not meta:
+            return False
+        data = json.loads(meta)
+        return data.get("sha256") == sha256_hex.lower() and data.get("size") == size
 
     @property
     def is_redis_connected(self) -> bool:
         return self._use_redis
 
+    @property
+    def backend(self) -> str:
+        """현재 사용 중인 저장소 (connecting: 백그라운드 연결 중, 메모리로 처리)"""
+        if self._use_redis:
+            return "redis"
+        if self._connect_task and not self._connect_task.done():
+            return "connecting"
+        return "memory"
+
 
 # 싱글톤 인스턴스
 cache = CacheService()
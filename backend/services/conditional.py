@@ -0,0 +1,47 @@
+import hashlib
+from typing import Optional
+from starlette.requests import Request
+from starlette.responses import Response
+
+# 압축 미들웨어가 인코딩별로 ETag 뒤에 붙이는 접미사 ("...-gzip")
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def make_etag(cache_key: str, *qualifiers) -> str:
+    """캐시 키(내용 해시 포함)와 응답 구분값으로 강한 ETag를 만듭니다."""
+    source = ":".join([cache_key, *(str(q) for q in qualifiers)])
+    return '"' + hashlib.sha256(source.encode()).hexdigest()[:32] + '"'
+
+
+def _opaque(tag: str) -> str:
+    """비교용 태그 (W/ 접두사와 압축 접미사 제거)"""
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """If-None-Match가 etag와 일치하는지 (약한 비교, RFC 9110 13.1.2)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = _opaque(etag)
+    return any(_opaque(tag) == target for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def check_not_modified(request: Request, etag: str) -> Optional[Response]:
+    """클라이언트가 같은 표현을 이미 가지고 있으면 304 응답을 돌려줍니다."""
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    return None
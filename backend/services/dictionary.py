@@ -0,0 +1,171 @@
+import asyncio
+import json
+import logging
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+from config import HAIKU_MODEL, WORD_LEMMATIZE, HOT_DICTIONARY_PATH, HOT_DICTIONARY_SIZE, HOT_DICTIONARY_REFRESH
+from services.cache import cache, CacheService
+
+logger = logging.getLogger(__name__)
+
+# 단어 조회 빈도 (Redis sorted set). 핫 사전을 만들 때 상위 단어를 고른다
+WORD_FREQUENCY_KEY = "stats:word-frequency"
+# 빈도 집계는 핫 사전 크기의 이 배수까지만 유지 (하위 단어는 flush 때 삭제)
+WORD_FREQUENCY_KEEP_FACTOR = 4
+# 이보다 긴 입력은 단어로 보지 않고 빈도 집계에서 제외
+MAX_RECORDED_WORD_LENGTH = 40
+
+_lemmatizer = None
+_lemmatizer_loaded = False
+
+
+def _load_lemmatizer():
+    """simplemma를 처음 사용할 때 로드합니다. 없으면 None (표제어 변환 생략)"""
+    global _lemmatizer, _lemmatizer_loaded
+    if not _lemmatizer_loaded:
+        try:
+            import simplemma
+            _lemmatizer = simplemma
+        except ImportError:
+            logger.warning("simplemma 패키지가 설치되지 않음, 표제어 변환 생략")
+            _lemmatizer = None
+        _lemmatizer_loaded = True
+    return _lemmatizer
+
+
+def _is_edge_symbol(char: str) -> bool:
+    # 문장 부호(P*)와 기호(S*): 따옴표, 괄호, 쉼표, 마침표, 말줄임표 등
+    return unicodedata.category(char)[0] in ("P", "S")
+
+
+def normalize_word(word: str, lemmatize: bool = WORD_LEMMATIZE) -> str:
+    """번역 캐시 키용 단어 정규화.
+
+    "Running", "running,", "“running.”" → "running" (lemmatize=True면 "run").
+    단어 안쪽의 아포스트로피/하이픈(don't, well-known)은 유지한다.
+    """
+    text = unicodedata.normalize("NFKC", word).strip()
+    start, end = 0, len(text)
+    while start < end and _is_edge_symbol(text[start]):
+        start += 1
+    while end > start and _is_edge_symbol(text[end - 1]):
+        end -= 1
+    normalized = " ".join(text[start:end].split()).casefold()
+
+    if lemmatize and normalized and " " not in normalized:
+        lemmatizer = _load_lemmatizer()
+        if lemmatizer is not None:
+            normalized = lemmatizer.lemmatize(normalized, lang="en").casefold()
+    return normalized
+
+
+def load_dictionary_file(path: str) -> Dict[str, str]:
+    """JSON 객체({"word": "번역"}) 또는 TSV(word<TAB>번역) 파일을 읽습니다."""
+    raw = Path(path).read_text(encoding="utf-8")
+    if path.endswith(".json"):
+        items = json.loads(raw).items()
+    else:
+        items = (line.split("\t", 1) for line in raw.splitlines() if "\t" in line)
+
+    entries = {}
+    for word, translation in items:
+        normalized = normalize_word(word)
+        if normalized and translation.strip():
+            entries[normalized] = translation.strip()
+    return entries
+
+
+class HotDictionary:
+    """자주 찾는 단어의 번역을 프로세스 안에 들고 있는 읽기 전용 사전.
+
+    파일에서 미리 읽거나, 조회 빈도 상위 단어의 캐시된 번역으로 만든다.
+    조회는 dict 한 번이므로 Redis/모델을 거치지 않는다.
+    갱신 시에는 새 dict를 만든 뒤 통째로 교체한다.
+    """
+
+    def __init__(self, size: int = HOT_DICTIONARY_SIZE):
+        self._entries: Dict[str, str] = {}
+        self._size = size
+        self._pending: Counter = Counter()  # 아직 Redis에 반영하지 않은 조회 수
+        self._task: Optional[asyncio.Task] = None
+        self.source = "empty"
+
+    def get(self, normalized: str) -> Optional[str]:
+        return self._entries.get(normalized)
+
+    def record(self, normalized: str):
+        """단어 조회 1회 기록 (주기적으로 Redis 빈도 집계에 반영)
+
+        빈 값, 너무 긴 값, 여러 단어(공백 포함)는 사전에 들어갈 수 없으므로 기록하지 않음.
+        다음 flush까지 쌓이는 서로 다른 단어 수도 빈도 집계 보관 한도까지만.
+        """
+        if self._size <= 0 or not normalized or len(normalized) > MAX_RECORDED_WORD_LENGTH:
+            return
+        if any(char.isspace() for char in normalized):
+            return
+        if normalized not in self._pending and len(self._pending) >= self._size * WORD_FREQUENCY_KEEP_FACTOR:
+            return
+        self._pending[normalized] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load_file(self, path: str):
+        started = time.perf_counter()
+        self._entries = load_dictionary_file(path)
+        self.source = "file"
+        logger.info(f"핫 사전 로드: {path} ({len(self._entries)}개, {(time.perf_counter() - started) * 1000:.0f}ms)")
+
+    async def flush(self):
+        """쌓인 조회 수를 빈도 집계에 반영"""
+        pending, self._pending = self._pending, Counter()
+        await cache.incr_scores(WORD_FREQUENCY_KEY, pending, max_members=self._size * WORD_FREQUENCY_KEEP_FACTOR)
+
+    async def build_from_cache(self, model: str = HAIKU_MODEL) -> Dict[str, str]:
+        """조회 빈도 상위 단어 중 번역이 캐시에 있는 것으로 사전을 만듭니다."""
+        await self.flush()
+        words = await cache.top_members(WORD_FREQUENCY_KEY, self._size)
+        values = await cache.get_many([CacheService.make_translate_key("word", model, word) for word in words])
+
+        entries = {}
+        for word, value in zip(words, values):
+            if value:
+                entries[word] = json.loads(value)["translation"]
+        self._entries = entries
+        self.source = "cache"
+        logger.info(f"핫 사전 갱신: 상위 {len(words)}개 중 {len(entries)}개")
+        return entries
+
+    def start(self):
+        """HOT_DICTIONARY_PATH가 있으면 파일을 읽고, 없으면 주기적으로 캐시 기록에서 다시 만든다."""
+        if HOT_DICTIONARY_PATH:
+            self.load_file(HOT_DICTIONARY_PATH)
+        if self._size > 0:
+            self._task = asyncio.create_task(self._refresh_loop(rebuild=not HOT_DICTIONARY_PATH))
+
+    async def _refresh_loop(self, rebuild: bool):
+        await cache.wait_ready()
+        while True:
+            try:
+                if rebuild:
+                    await self.build_from_cache()
+                else:
+                    await self.flush()
+            except Exception as e:
+                logger.warning(f"핫 사전 갱신 실패 ({e})")
+            await asyncio.sleep(HOT_DICTIONARY_REFRESH)
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        try:
+            await self.flush()
+        except Exception:
+            pass
+
+
+# 싱글톤 인스턴스
+hot_dictionary = HotDictionary()
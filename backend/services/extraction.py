@@ -2,10 +2,14 @@ import re
 import json
 import asyncio
 import logging
-from typing import List, Tuple, Optional
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Set, Tuple, Optional
 from concurrent.futures import ThreadPoolExecutor
-import anthropic
-from config import ANTHROPIC_API_KEY, HAIKU_MODEL
+from config import ANTHROPIC_API_KEY, UPSTREAM_TIMEOUT_ANALYZE
+from services.upstream import scheduler, Priority
+from services.metrics import timed
+from services.tokens import TOKEN_PATTERN, NEWLINE_ID, TokenTable, normalize_token, tokenize
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -47,20 +51,14 @@ JSON 형식으로만 응답 (다른 텍스트 없이):
 
 
 def split_into_words(text: str) -> List[str]:
-    """텍스트를 단어 단위로 분리합니다. 줄바꿈은 별도 토큰으로 처리."""
-    result = []
-    lines = text.split('\n')
+    """텍스트를 단어 단위로 분리합니다. 줄바꿈은 별도 토큰으로 처리.
 
-    for i, line in enumerate(lines):
-        words = re.findall(r'\S+', line)
-        result.extend(words)
-
-        if i < len(lines) - 1:
-            result.append('\n')
-
-    return result
+    tokenize(text).words()와 같은 결과 (단어 리스트만 필요한 호환용)
+    """
+    return TOKEN_PATTERN.findall(text)
 
 
+@timed("chunk")
 def split_into_chunks(text: str) -> List[str]:
     """텍스트를 청크로 분할합니다. 챕터나 섹션 경계를 우선 감지."""
     if len(text) <= CHUNK_SIZE:
@@ -143,35 +141,112 @@ def split_by_size(text: str) -> List[str]:
     return chunks
 
 
-def match_keywords_to_words(
-    words: List[str],
-    keywords: List[dict],
-) -> List[float]:
-    """문장/구절을 원문 단어에 매칭하여 점수 배열 생성."""
-    scores = [0.0] * len(words)
-
-    # 불용어 (단독으로 매칭되면 안 되는 단어들)
-    stopwords = {
-        'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves',
-        'you', 'your', 'yours', 'yourself', 'yourselves',
-        'he', 'him', 'his', 'himself', 'she', 'her', 'hers', 'herself',
-        'it', 'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves',
-        'what', 'which', 'who', 'whom', 'this', 'that', 'these', 'those',
-        'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-        'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing',
-        'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as',
-        'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about',
-        'against', 'between', 'into', 'through', 'during', 'before',
-        'after', 'above', 'below', 'to', 'from', 'up', 'down', 'in',
-        'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then',
-        'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
-        'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no',
-        'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very',
-        's', 't', 'can', 'will', 'just', 'don', 'should', 'now', 'd',
-        'll', 'm', 'o', 're', 've', 'y', 'ain', 'aren', 'couldn', 'didn',
-        'doesn', 'hadn', 'hasn', 'haven', 'isn', 'ma', 'mightn', 'mustn',
-        'needn', 'shan', 'shouldn', 'wasn', 'weren', 'won', 'wouldn'
-    }
+# 불용어 (단독으로 매칭되면 안 되는 단어들)
+STOPWORDS = {
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves',
+    'you', 'your', 'yours', 'yourself', 'yourselves',
+    'he', 'him', 'his', 'himself', 'she', 'her', 'hers', 'herself',
+    'it', 'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves',
+    'what', 'which', 'who', 'whom', 'this', 'that', 'these', 'those',
+    'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing',
+    'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as',
+    'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about',
+    'against', 'between', 'into', 'through', 'during', 'before',
+    'after', 'above', 'below', 'to', 'from', 'up', 'down', 'in',
+    'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then',
+    'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all',
+    'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no',
+    'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very',
+    's', 't', 'can', 'will', 'just', 'don', 'should', 'now', 'd',
+    'll', 'm', 'o', 're', 've', 'y', 'ain', 'aren', 'couldn', 'didn',
+    'doesn', 'hadn', 'hasn', 'haven', 'isn', 'ma', 'mightn', 'mustn',
+    'needn', 'shan', 'shouldn', 'wasn', 'weren', 'won', 'wouldn'
+}
+
+
+def _is_stopword(word: str) -> bool:
+    return word.lower().strip('.,!?"\';:') in STOPWORDS
+
+
+class _FormMatcher:
+    """키워드 단어와 매칭되는 정규화 형태 id 집합을 찾습니다.
+
+    비교 규칙은 형태가 같거나, 한쪽이 다른 쪽의 부분 문자열이면 매칭.
+    - 키워드에 포함되는 형태: 키워드의 모든 부분 문자열을 형태 사전에서 조회
+    - 키워드를 포함하는 형태: 줄바꿈으로 이어 붙인 형태 문자열에서 str.find
+    같은 키워드 단어는 한 번만 계산한다.
+    """
+
+    def __init__(self, vocab: List[str]):
+        self._form_ids = {form: token_id for token_id, form in enumerate(vocab) if token_id != NEWLINE_ID}
+        # 형태에는 공백/줄바꿈이 없으므로 줄바꿈을 구분자로 쓴다 (vocab[0]이 줄바꿈 자리)
+        self._blob = "\n".join(vocab)
+        self._offsets = array('I')
+        position = 0
+        for form in vocab:
+            self._offsets.append(position)
+            position += len(form) + 1
+        self._all_ids = frozenset(self._form_ids.values())
+        self._memo: Dict[str, frozenset] = {}
+
+    def ids_for(self, kw_clean: str) -> frozenset:
+        ids = self._memo.get(kw_clean)
+        if ids is not None:
+            return ids
+
+        if not kw_clean:
+            # 빈 문자열은 모든 형태에 포함됨
+            ids = self._all_ids
+        else:
+            found: Set[int] = set()
+            length = len(kw_clean)
+            if "" in self._form_ids:
+                found.add(self._form_ids[""])
+            for start in range(length):
+                for end in range(start + 1, length + 1):
+                    token_id = self._form_ids.get(kw_clean[start:end])
+                    if token_id is not None:
+                        found.add(token_id)
+
+            blob, offsets = self._blob, self._offsets
+            position = blob.find(kw_clean)
+            while position != -1:
+                token_id = bisect_right(offsets, position) - 1
+                found.add(token_id)
+                # 같은 형태 안의 다음 위치는 건너뛰고 다음 형태부터 검색
+                next_form = offsets[token_id + 1] if token_id + 1 < len(offsets) else len(blob)
+                position = blob.find(kw_clean, next_form)
+            found.discard(NEWLINE_ID)
+            ids = frozenset(found)
+
+        self._memo[kw_clean] = ids
+        return ids
+
+
+@timed("match")
+def match_keywords(table: TokenTable, keywords: List[dict]) -> List[float]:
+    """문장/구절을 토큰 표에 매칭하여 토큰별 점수 배열 생성.
+
+    줄바꿈 토큰은 건너뛰고 연속된 본문 토큰과 비교한다.
+    """
+    raw_ids, raw_forms = table.raw_ids, table.raw_forms
+    total = len(raw_ids)
+    scores = array('d', bytes(8 * total))
+    if not total:
+        return scores.tolist()
+
+    # 줄바꿈을 제외한 본문 토큰 위치와 (정규화) 형태 id, 형태별 본문 순번 목록
+    content = array('I', (i for i in range(total) if raw_ids[i] != NEWLINE_ID))
+    content_ids = array('I', (raw_forms[raw_ids[i]] for i in content))
+    postings: Dict[int, array] = {}
+    for rank, token_id in enumerate(content_ids):
+        posting = postings.get(token_id)
+        if posting is None:
+            posting = postings[token_id] = array('I')
+        posting.append(rank)
+
+    matcher = _FormMatcher(table.vocab)
 
     for kw in keywords:
         keyword_text = kw.get("text", "")
@@ -186,78 +261,88 @@ def match_keywords_to_words(
             continue
 
         # 단일 단어이고 불용어면 스킵
-        if len(kw_words) == 1 and kw_words[0].lower().strip('.,!?"\';:') in stopwords:
+        if len(kw_words) == 1 and _is_stopword(kw_words[0]):
             continue
 
         # 2단어 이하이고 모두 불용어면 스킵
-        if len(kw_words) <= 2:
-            non_stop = [w for w in kw_words if w.lower().strip('.,!?"\';:') not in stopwords]
-            if len(non_stop) == 0:
-                continue
-
-        # 원문에서 문장/구절 시퀀스 찾기
-        for i in range(len(words) - len(kw_words) + 1):
-            match = True
-            matched_indices = []
+        if len(kw_words) <= 2 and all(_is_stopword(w) for w in kw_words):
+            continue
 
-            j = i
-            for kw_word in kw_words:
-                # 줄바꿈 건너뛰기
-                while j < len(words) and words[j] == '\n':
-                    j += 1
+        length = len(kw_words)
+        if total - length < 0 or len(content) < length:
+            continue
 
-                if j >= len(words):
-                    match = False
-                    break
+        # 원문 인덱스 total - length 이하에서 시작한 매칭만 인정 (줄바꿈에서 시작하면 다음 본문 토큰부터)
+        last_start = min(bisect_left(content, total - length), len(content) - length)
 
-                # 단어 비교 (대소문자 무시, 구두점 제거하여 비교)
-                word_clean = words[j].lower().strip('.,!?"\';:()[]{}')
-                kw_clean = kw_word.lower().strip('.,!?"\';:()[]{}')
+        allowed = [matcher.ids_for(normalize_token(w)) for w in kw_words]
+        first = allowed[0]
+        if len(first) * 4 < len(postings):
+            candidates = sorted(rank for token_id in first for rank in postings.get(token_id, ()))
+        else:
+            candidates = range(len(content))
 
-                if word_clean == kw_clean or kw_clean in word_clean or word_clean in kw_clean:
-                    matched_indices.append(j)
-                    j += 1
-                else:
-                    match = False
+        for rank in candidates:
+            if rank > last_start:
+                break
+            if content_ids[rank] not in first:
+                continue
+            for offset in range(1, length):
+                if content_ids[rank + offset] not in allowed[offset]:
                     break
+            else:
+                for offset in range(length):
+                    index = content[rank + offset]
+                    if scores[index] < keyword_score:
+                        scores[index] = keyword_score
 
-            if match and len(matched_indices) == len(kw_words):
-                for idx in matched_indices:
-                    scores[idx] = max(scores[idx], keyword_score)
-
-    return scores
+    return scores.tolist()
 
 
-def extract_chunk_sync(client: anthropic.Anthropic, chunk_text: str, chunk_idx: int) -> List[dict]:
-    """단일 청크에서 키워드 추출 (동기)."""
-    logger.info(f"청크 {chunk_idx} 처리 시작 ({len(chunk_text):,}자)")
-    try:
-        message = client.messages.create(
-            model=HAIKU_MODEL,
-            max_tokens=4096,
-            messages=[
-                {"role": "user", "content": EXTRACTION_PROMPT + chunk_text}
-            ]
-        )
+def match_keywords_to_words(
+    words: List[str],
+    keywords: List[dict],
+) -> List[float]:
+    """문장/구절을 원문 단어에 매칭하여 점수 배열 생성. (단어 리스트 입력 호환용)"""
+    return match_keywords(TokenTable.from_words(words), keywords)
 
-        response_text = message.content[0].text.strip()
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
 
-        if not json_match:
-            logger.warning(f"청크 {chunk_idx}: JSON 응답 없음")
-            return []
+async def extract_chunk(chunk_text: str, chunk_idx: int, priority: Priority = Priority.INTERACTIVE) -> List[dict]:
+    """단일 청크에서 키워드 추출. 업스트림 오류는 그대로 전파합니다."""
+    logger.info(f"청크 {chunk_idx} 처리 시작 ({len(chunk_text):,}자)")
+    message = await scheduler.create(
+        priority=priority,
+        max_tokens=4096,
+        messages=[
+            {"role": "user", "content": EXTRACTION_PROMPT + chunk_text}
+        ],
+        timeout=UPSTREAM_TIMEOUT_ANALYZE,
+        kind="analyze",
+    )
+
+    response_text = message.content[0].text.strip()
+    json_match = re.search(r'\{[\s\S]*\}', response_text)
+
+    if not json_match:
+        logger.warning(f"청크 {chunk_idx}: JSON 응답 없음")
+        return []
 
+    try:
         result = json.loads(json_match.group())
-        # sentences 또는 keywords 둘 다 지원 (하위 호환성)
-        sentences = result.get("sentences", result.get("keywords", []))
-        logger.info(f"청크 {chunk_idx} 완료: {len(sentences)}개 문장 추출")
-        return sentences
-    except Exception as e:
-        logger.error(f"청크 {chunk_idx} 에러: {e}")
+    except json.JSONDecodeError as e:
+        logger.warning(f"청크 {chunk_idx}: JSON 파싱 실패 ({e})")
         return []
 
+    # sentences 또는 keywords 둘 다 지원 (하위 호환성)
+    sentences = result.get("sentences", result.get("keywords", []))
+    logger.info(f"청크 {chunk_idx} 완료: {len(sentences)}개 문장 추출")
+    return sentences
+
 
-async def extract_important_parts_single_chunk(text: str) -> Tuple[List[str], List[float]]:
+async def extract_important_parts_single_chunk(
+    text: str,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Tuple[List[str], List[float]]:
     """
     단일 청크(또는 짧은 텍스트)를 Haiku API로 분석합니다.
 
@@ -265,27 +350,25 @@ async def extract_important_parts_single_chunk(text: str) -> Tuple[List[str], Li
         words: 단어 리스트
         scores: 각 단어의 중요도 점수 (0~1)
     """
-    words = split_into_words(text)
+    table = tokenize(text)
 
-    if not words:
+    if not len(table):
         return [], []
 
     if not ANTHROPIC_API_KEY:
         raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다.")
 
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-
-    logger.info(f"텍스트 분석 시작 ({len(text):,}자, {len(words):,}단어)")
+    logger.info(f"텍스트 분석 시작 ({len(text):,}자, {len(table):,}단어)")
 
     # 단일 청크 처리
-    keywords = extract_chunk_sync(client, text, 0)
+    keywords = await extract_chunk(text, 0, priority)
 
     logger.info(f"{len(keywords)}개 키워드 추출 완료")
 
     # 키워드를 단어에 매칭
-    scores = match_keywords_to_words(words, keywords)
+    scores = match_keywords(table, keywords)
 
-    return words, scores
+    return table.words(), scores
 
 
 def get_chunk_count(text: str) -> int:
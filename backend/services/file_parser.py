@@ -1,12 +1,32 @@
 import re
+import logging
 from io import BytesIO
 from collections import Counter
-import pdfplumber
-from docx import Document
+from typing import Dict, List, Optional, Set, Tuple
+from services.metrics import timed, PARSE_BOILERPLATE_CHARS
+from services.upstream import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 반복 머리글/바닥글 제거
+BOILERPLATE_EDGE_LINES = 3        # 페이지 위/아래에서 검사할 줄 수
+BOILERPLATE_MARGIN_RATIO = 0.15   # 머리글/바닥글로 볼 페이지 위/아래 영역 (페이지 높이 비율)
+BOILERPLATE_MIN_PAGES = 3         # 이 페이지 수 이상에서 같은 위치/내용이면 제거
+BOILERPLATE_MIN_RATIO = 0.5       # 연속으로 반복되지 않으면 전체 페이지 중 이 비율 이상에 나와야 제거
+
+# 쪽번호만 있는 줄: "12", "xii", "- 12 -", "Page 12", "12 / 300", "12 of 300"
+# (로마 숫자는 앞붙이 쪽번호 범위인 i~xcix만, "mix"/"civil" 같은 단어가 걸리지 않도록)
+PAGE_NUMBER_LINE = re.compile(
+    r'^[\W_]*(?:page\s*)?(?:\d+|(?=[ivxl])(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3}))(?:\s*(?:/|of)\s*\d+)?[\W_]*$'
+)
+# 줄 끝의 쪽번호: "Book Title 12", "Book Title | 12"
+TRAILING_PAGE_NUMBER = re.compile(r'(?<=\s)[\W_]*\d+[\W_]*$')
 
 
 def extract_text_from_pdf(file_content: bytes) -> str:
     """PDF 파일에서 폰트 크기 기반으로 제목을 구분하여 텍스트를 추출합니다."""
+    import pdfplumber  # 시작 시간 단축을 위해 처음 사용할 때 로드
+
     with pdfplumber.open(BytesIO(file_content)) as pdf:
         # 1단계: 모든 문자의 폰트 크기를 수집하여 본문 크기 결정
         all_sizes = []
@@ -29,8 +49,8 @@ def extract_text_from_pdf(file_content: bytes) -> str:
         # 제목으로 간주할 최소 크기 (본문보다 1.2배 이상 큰 것)
         title_threshold = body_size * 1.2
 
-        # 2단계: 페이지별로 텍스트 추출 (폰트 크기 정보 포함)
-        result_parts = []
+        # 2단계: 페이지별로 줄 추출 (폰트 크기, 머리글/바닥글 영역 정보 포함)
+        pages = []
 
         for page in pdf.pages:
             chars = page.chars
@@ -38,9 +58,8 @@ def extract_text_from_pdf(file_content: bytes) -> str:
                 continue
 
             # 같은 줄의 문자들을 그룹화 (y 좌표 기준)
-            lines = _group_chars_into_lines(chars)
-
-            for line_chars in lines:
+            lines = []
+            for line_chars in _group_chars_into_lines(chars):
                 if not line_chars:
                     continue
 
@@ -55,6 +74,20 @@ def extract_text_from_pdf(file_content: bytes) -> str:
                 if not text:
                     continue
 
+                lines.append((text, avg_size, line_chars[0].get("top", 0)))
+
+            # 제목 크기 줄("Chapter 3" 등)은 머리글 후보에서 제외
+            pages.append([
+                (text, avg_size, _edge_region(i, len(lines), top, page.height) if avg_size < title_threshold else None)
+                for i, (text, avg_size, top) in enumerate(lines)
+            ])
+
+        # 3단계: 여러 페이지에 반복되는 머리글/바닥글/쪽번호 제거
+        pages = _strip_repeated_edge_lines(pages)
+
+        result_parts = []
+        for lines in pages:
+            for text, avg_size, _ in lines:
                 # 제목인 경우 앞에 빈 줄 추가
                 if avg_size >= title_threshold:
                     if result_parts and result_parts[-1] != "":
@@ -68,6 +101,85 @@ def extract_text_from_pdf(file_content: bytes) -> str:
         return _merge_body_lines(result_parts, body_size)
 
 
+def _edge_region(index: int, count: int, top: float, page_height: Optional[float]) -> Optional[str]:
+    """페이지 위/아래 가장자리 줄이면 "top"/"bottom", 아니면 None
+
+    page_height를 모르면(텍스트만 있는 경우) 줄 순서로만 판단한다.
+    """
+    margin = page_height * BOILERPLATE_MARGIN_RATIO if page_height else None
+    if index < BOILERPLATE_EDGE_LINES and (margin is None or top <= margin):
+        return "top"
+    if index >= count - BOILERPLATE_EDGE_LINES and (margin is None or top >= page_height - margin):
+        return "bottom"
+    return None
+
+
+def _normalize_boilerplate(text: str) -> str:
+    """머리글/바닥글 비교용 정규화 (쪽번호만 있는 줄과 줄 끝 쪽번호를 #으로)
+
+    다른 숫자는 그대로 둔다 ("Chapter 1"과 "Chapter 2"는 다른 줄).
+    """
+    normalized = re.sub(r'\s+', ' ', text.casefold()).strip()
+    if PAGE_NUMBER_LINE.match(normalized):
+        return "#"
+    return TRAILING_PAGE_NUMBER.sub('#', normalized)
+
+
+def _is_repeated(page_indexes: List[int], total_pages: int) -> bool:
+    """BOILERPLATE_MIN_PAGES쪽 이상 연속으로 나오거나, 전체 페이지의 과반 이상에 나오면 반복 줄.
+
+    몇 쪽 걸러 한 번씩만 나오는 줄(장 제목 등)은 남긴다.
+    """
+    if len(page_indexes) < BOILERPLATE_MIN_PAGES:
+        return False
+    if len(page_indexes) >= total_pages * BOILERPLATE_MIN_RATIO:
+        return True
+
+    run = 1
+    for previous, current in zip(page_indexes, page_indexes[1:]):
+        run = run + 1 if current == previous + 1 else 1
+        if run >= BOILERPLATE_MIN_PAGES:
+            return True
+    return False
+
+
+def _strip_repeated_edge_lines(pages: List[list]) -> List[list]:
+    """여러 페이지의 같은 위치(위/아래)에 같은 내용으로 반복되는 줄을 제거합니다.
+
+    pages: 페이지별 [(텍스트, 폰트 크기, 영역)] 목록. 영역은 _edge_region 결과.
+    """
+    seen: Dict[Tuple[str, str], List[int]] = {}
+    for page_index, lines in enumerate(pages):
+        for key in {(region, _normalize_boilerplate(text)) for text, _, region in lines if region}:
+            seen.setdefault(key, []).append(page_index)
+
+    repeated: Set[Tuple[str, str]] = {
+        key for key, page_indexes in seen.items() if _is_repeated(page_indexes, len(pages))
+    }
+    if not repeated:
+        return pages
+
+    stripped = []
+    removed = []
+    for lines in pages:
+        kept = []
+        for line in lines:
+            text, _, region = line
+            if region and (region, _normalize_boilerplate(text)) in repeated:
+                removed.append(text)
+            else:
+                kept.append(line)
+        stripped.append(kept)
+
+    removed_text = "\n".join(removed)
+    PARSE_BOILERPLATE_CHARS.inc(len(removed_text))
+    logger.info(
+        f"반복 머리글/바닥글 제거: {len(pages)}쪽에서 {len(removed)}줄, "
+        f"{len(removed_text)}자 (약 {estimate_tokens(removed_text)} 토큰) 절감"
+    )
+    return stripped
+
+
 def _group_chars_into_lines(chars: list) -> list:
     """문자들을 y 좌표 기준으로 줄 단위로 그룹화합니다."""
     if not chars:
@@ -149,16 +261,21 @@ def _merge_body_lines(parts: list, body_size: float) -> str:
 
 def _fallback_extract(pdf) -> str:
     """폰트 정보가 없을 때 기본 텍스트 추출."""
-    text_parts = []
+    pages = []
     for page in pdf.pages:
         text = page.extract_text()
         if text:
-            text_parts.append(text)
-    return "\n".join(text_parts)
+            lines = text.split("\n")
+            pages.append([(line, 0.0, _edge_region(i, len(lines), 0.0, None)) for i, line in enumerate(lines)])
+
+    pages = _strip_repeated_edge_lines(pages)
+    return "\n".join("\n".join(text for text, _, _ in lines) for lines in pages if lines)
 
 
 def extract_text_from_docx(file_content: bytes) -> str:
     """DOCX 파일에서 텍스트를 추출합니다."""
+    from docx import Document  # 처음 사용할 때 로드
+
     doc = Document(BytesIO(file_content))
     text_parts = []
 
@@ -178,11 +295,12 @@ def extract_text(filename: str, file_content: bytes) -> str:
     """파일 확장자에 따라 적절한 파서를 사용하여 텍스트를 추출합니다."""
     filename_lower = filename.lower()
 
-    if filename_lower.endswith(".pdf"):
-        return extract_text_from_pdf(file_content)
-    elif filename_lower.endswith(".docx"):
-        return extract_text_from_docx(file_content)
-    elif filename_lower.endswith(".txt"):
-        return extract_text_from_txt(file_content)
-    else:
-        raise ValueError(f"지원하지 않는 파일 형식입니다: {filename}")
+    with timed("parse"):
+        if filename_lower.endswith(".pdf"):
+            return extract_text_from_pdf(file_content)
+        elif filename_lower.endswith(".docx"):
+            return extract_text_from_docx(file_content)
+        elif filename_lower.endswith(".txt"):
+            return extract_text_from_txt(file_content)
+        else:
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {filename}")
@@ -0,0 +1,551 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from config import (
+    JOB_QUEUE_MODE,
+    JOB_VISIBILITY_TIMEOUT,
+    JOB_MAX_ATTEMPTS,
+    JOB_RESULT_TIMEOUT,
+    JOB_RESULT_TTL,
+    JOB_WORKER_CONCURRENCY,
+    UPSTREAM_RPM,
+    UPSTREAM_TPM,
+    UPSTREAM_PROCESSES,
+)
+from services import file_parser
+from services.extraction import extract_important_parts_single_chunk
+from services.upstream import Priority, UpstreamTimeoutError
+from services.metrics import timed, JOBS_PROCESSED
+
+logger = logging.getLogger(__name__)
+
+
+def warn_if_rate_limits_unshared():
+    """워커 프로세스를 쓰는데 UPSTREAM_PROCESSES가 1이면 계정 한도가 프로세스 수만큼 곱해짐을 경고"""
+    if (UPSTREAM_RPM > 0 or UPSTREAM_TPM > 0) and UPSTREAM_PROCESSES <= 1:
+        logger.warning(
+            "UPSTREAM_PROCESSES=1: RPM/TPM 한도는 프로세스마다 따로 적용되므로 "
+            "API 서버와 워커 프로세스 수의 합으로 설정하세요 (설정하지 않으면 한도가 그만큼 곱해짐)"
+        )
+
+# 작업 종류 (워커는 종류별로 나눠 띄울 수 있음: 파싱은 CPU, 분석은 업스트림 I/O)
+EXTRACT_TEXT = "extract_text"
+ANALYZE_CHUNK = "analyze_chunk"
+JOB_KINDS = (EXTRACT_TEXT, ANALYZE_CHUNK)
+
+KEY_PREFIX = "jobs"
+JOB_TTL = 3600              # 대기 중인 작업 데이터 보관 시간(초)
+CLAIM_BLOCK_SECONDS = 1.0   # 대기열이 비었을 때 한 번에 기다리는 시간(초)
+READY_SIGNALS_MAX = 100     # 대기 중인 워커를 깨우는 신호 리스트 최대 길이
+
+# 작업은 우선순위별 대기열에 넣고 값이 작은 우선순위부터 가져간다 (업스트림 스케줄러와 같은 순서)
+PRIORITIES = tuple(sorted(Priority))
+
+# 워커에서 난 오류 중 API 쪽에서 같은 타입으로 다시 올릴 것 (나머지는 JobError)
+_ERROR_TYPES = {"ValueError": ValueError, "UpstreamTimeoutError": UpstreamTimeoutError}
+# 다시 시도해도 결과가 같은 오류 (지원하지 않는 파일 형식 등)는 재시도하지 않음
+NON_RETRYABLE = (ValueError,)
+
+
+class JobError(RuntimeError):
+    """워커에서 작업이 최종 실패함 (재시도 소진)"""
+
+
+class JobTimeoutError(UpstreamTimeoutError):
+    """제한 시간 안에 작업 결과를 받지 못함"""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: dict
+    blob: bytes = b""   # 파일 내용 등 JSON에 넣지 않는 바이너리
+    attempts: int = 0   # 지금까지 가져간 횟수 (현재 시도 포함)
+    priority: Priority = Priority.INTERACTIVE
+
+
+def _ok(value) -> dict:
+    return {"ok": True, "value": value}
+
+
+def _failed(error: Exception) -> dict:
+    return {"ok": False, "error_type": type(error).__name__, "error": str(error)}
+
+
+def _unwrap(result: dict):
+    if result["ok"]:
+        return result["value"]
+    raise _ERROR_TYPES.get(result["error_type"], JobError)(result["error"])
+
+
+class MemoryJobQueue:
+    """프로세스 안 작업 대기열 (Redis 없이 같은 흐름으로 실행/확인할 때).
+
+    RedisJobQueue와 같은 인터페이스와 의미(임대, 재시도, 만료 회수)를 가진다.
+    """
+
+    name = "memory"
+
+    def __init__(self, visibility_timeout: float = JOB_VISIBILITY_TIMEOUT, max_attempts: int = JOB_MAX_ATTEMPTS):
+        self._visibility_timeout = visibility_timeout
+        self._max_attempts = max_attempts
+        self._queues: Dict[Tuple[str, Priority], Deque[str]] = {
+            (kind, priority): deque() for kind in JOB_KINDS for priority in PRIORITIES
+        }
+        self._jobs: Dict[str, Job] = {}
+        self._leases: Dict[str, float] = {}  # 작업 id → 임대 만료 시각
+        self._results: Dict[str, asyncio.Future] = {}
+        self._changed = asyncio.Event()
+
+    async def enqueue(self, kind: str, payload: dict, blob: bytes = b"",
+                      priority: Priority = Priority.INTERACTIVE) -> str:
+        job = Job(uuid.uuid4().hex, kind, payload, blob, priority=Priority(priority))
+        self._jobs[job.id] = job
+        self._results[job.id] = asyncio.get_running_loop().create_future()
+        self._queues[kind, job.priority].appendleft(job.id)
+        self._changed.set()
+        return job.id
+
+    async def wait_result(self, job_id: str, timeout: float) -> Optional[dict]:
+        future = self._results[job_id]
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._results.pop(job_id, None)
+
+    async def claim(self, kinds: Sequence[str], timeout: float = CLAIM_BLOCK_SECONDS) -> Optional[Job]:
+        deadline = time.monotonic() + timeout
+        while True:
+            for kind, priority in ((kind, priority) for priority in PRIORITIES for kind in kinds):
+                queue = self._queues[kind, priority]
+                while queue:
+                    job = self._jobs.get(queue.pop())
+                    if job is not None:
+                        job.attempts += 1
+                        self._leases[job.id] = time.monotonic() + self._visibility_timeout
+                        return job
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    async def extend(self, job: Job):
+        if job.id in self._leases:
+            self._leases[job.id] = time.monotonic() + self._visibility_timeout
+
+    async def ack(self, job: Job, value):
+        self._finish(job.id, _ok(value))
+
+    async def fail(self, job: Job, error: Exception, retry: bool) -> bool:
+        self._leases.pop(job.id, None)
+        if retry and job.attempts < self._max_attempts:
+            self._requeue(job)
+            return True
+        self._finish(job.id, _failed(error))
+        return False
+
+    async def requeue_expired(self, kinds: Sequence[str]) -> int:
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, deadline in self._leases.items()
+            if deadline <= now and self._jobs[job_id].kind in kinds
+        ]
+        for job_id in expired:
+            job = self._jobs[job_id]
+            del self._leases[job_id]
+            if job.attempts < self._max_attempts:
+                self._requeue(job)
+            else:
+                self._finish(job_id, _failed(JobError("작업 임대 시간 초과 (재시도 소진)")))
+        return len(expired)
+
+    async def depth(self) -> Dict[str, int]:
+        return {kind: sum(len(self._queues[kind, priority]) for priority in PRIORITIES) for kind in JOB_KINDS}
+
+    async def close(self):
+        pass
+
+    def _requeue(self, job: Job):
+        # 다시 시도하는 작업은 같은 우선순위에서 맨 앞에서 가져가도록
+        self._queues[job.kind, job.priority].append(job.id)
+        self._changed.set()
+
+    def _finish(self, job_id: str, result: dict):
+        self._leases.pop(job_id, None)
+        self._jobs.pop(job_id, None)
+        future = self._results.get(job_id)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+
+class RedisJobQueue:
+    """Redis 리스트 기반 신뢰성 있는 작업 대기열.
+
+    - jobs:{kind}:queue:{priority} 우선순위별 대기 중인 작업 id (LPUSH로 넣고 오른쪽에서 가져감).
+                                   워커는 interactive → prefetch → bulk 순으로 확인
+    - jobs:{kind}:ready      새 작업 신호. 대기열이 모두 비면 워커는 여기서 BLPOP으로 기다림
+    - jobs:{kind}:processing 워커가 가져간 작업 id (LMOVE로 원자적으로 이동)
+    - jobs:{kind}:leases     작업 id → 임대 만료 시각 (sorted set). 처리 중에는 워커가 주기적으로 연장
+    - jobs:job:{id}          작업 내용 (hash: kind, payload, blob, attempts, priority)
+    - jobs:result:{id}       결과 (API 쪽은 BLPOP으로 대기)
+    임대가 만료된 작업(워커 중단/재시작)은 다른 워커가 회수해 다시 대기열에 넣는다.
+    한 작업이 두 번 실행될 수 있으며 (at-least-once) 먼저 도착한 결과를 사용한다.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        client,
+        visibility_timeout: float = JOB_VISIBILITY_TIMEOUT,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        result_ttl: int = JOB_RESULT_TTL,
+    ):
+        self._redis = client
+        self._visibility_timeout = visibility_timeout
+        self._max_attempts = max_attempts
+        self._result_ttl = result_ttl
+
+    @classmethod
+    async def connect(cls, redis_url: str) -> "RedisJobQueue":
+        import redis.asyncio as redis
+
+        # 파일 내용을 그대로 저장하므로 응답을 문자열로 디코딩하지 않음
+        client = redis.from_url(redis_url)
+        await client.ping()
+        return cls(client)
+
+    @staticmethod
+    def _key(kind: str, part: str) -> str:
+        return f"{KEY_PREFIX}:{kind}:{part}"
+
+    @classmethod
+    def _queue_key(cls, kind: str, priority: Priority) -> str:
+        return cls._key(kind, f"queue:{Priority(priority).name.lower()}")
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{KEY_PREFIX}:job:{job_id}"
+
+    @staticmethod
+    def _result_key(job_id: str) -> str:
+        return f"{KEY_PREFIX}:result:{job_id}"
+
+    async def enqueue(self, kind: str, payload: dict, blob: bytes = b"",
+                      priority: Priority = Priority.INTERACTIVE) -> str:
+        job_id = uuid.uuid4().hex
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping={
+                "kind": kind, "payload": json.dumps(payload), "blob": blob, "attempts": 0, "priority": int(priority),
+            })
+            pipe.expire(self._job_key(job_id), JOB_TTL)
+            pipe.lpush(self._queue_key(kind, priority), job_id)
+            self._signal_ready(pipe, kind)
+            await pipe.execute()
+        return job_id
+
+    def _signal_ready(self, pipe, kind: str):
+        pipe.lpush(self._key(kind, "ready"), 1)
+        pipe.ltrim(self._key(kind, "ready"), 0, READY_SIGNALS_MAX - 1)
+
+    async def wait_result(self, job_id: str, timeout: float) -> Optional[dict]:
+        item = await self._redis.blpop([self._result_key(job_id)], timeout=timeout)
+        if item is None:
+            return None
+        return json.loads(item[1])
+
+    async def claim(self, kinds: Sequence[str], timeout: float = CLAIM_BLOCK_SECONDS) -> Optional[Job]:
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self._claim_next(kinds)
+            if job is not None:
+                return job
+
+            # 모두 비어 있으면 새 작업 신호를 기다렸다가 다시 우선순위 순으로 확인
+            # (BLMOVE는 리스트 하나만 기다릴 수 있어 우선순위별 대기열에 쓸 수 없음).
+            # 다른 워커가 먼저 가져간 작업의 신호도 남아 있을 수 있으므로 제한 시간까지 반복
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            signal = await self._redis.blpop([self._key(kind, "ready") for kind in kinds], timeout=remaining)
+            if signal is None:
+                return None
+
+    async def _claim_next(self, kinds: Sequence[str]) -> Optional[Job]:
+        for priority in PRIORITIES:
+            for kind in kinds:
+                while True:
+                    job_id = await self._redis.lmove(
+                        self._queue_key(kind, priority), self._key(kind, "processing"), "RIGHT", "LEFT"
+                    )
+                    if not job_id:
+                        break
+                    job = await self._lease(kind, job_id.decode())
+                    if job is not None:
+                        return job
+        return None
+
+    async def _lease(self, kind: str, job_id: str) -> Optional[Job]:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self._key(kind, "leases"), {job_id: time.time() + self._visibility_timeout})
+            pipe.hincrby(self._job_key(job_id), "attempts", 1)
+            pipe.hgetall(self._job_key(job_id))
+            _, attempts, data = await pipe.execute()
+
+        if b"kind" not in data:
+            # 작업 데이터가 만료되었거나 이미 다른 워커가 끝낸 작업
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.zrem(self._key(kind, "leases"), job_id)
+                pipe.lrem(self._key(kind, "processing"), 0, job_id)
+                pipe.delete(self._job_key(job_id))
+                await pipe.execute()
+            return None
+        return Job(
+            job_id, kind, json.loads(data[b"payload"]), data.get(b"blob", b""), int(attempts),
+            Priority(int(data.get(b"priority", Priority.INTERACTIVE))),
+        )
+
+    async def extend(self, job: Job):
+        await self._redis.zadd(
+            self._key(job.kind, "leases"), {job.id: time.time() + self._visibility_timeout}, xx=True
+        )
+
+    async def ack(self, job: Job, value):
+        await self._finish(job.kind, job.id, _ok(value))
+
+    async def fail(self, job: Job, error: Exception, retry: bool) -> bool:
+        if retry and job.attempts < self._max_attempts:
+            await self._requeue(job.kind, job.id, job.priority)
+            return True
+        await self._finish(job.kind, job.id, _failed(error))
+        return False
+
+    async def requeue_expired(self, kinds: Sequence[str]) -> int:
+        count = 0
+        now = time.time()
+        for kind in kinds:
+            leases = self._key(kind, "leases")
+            # 가져간 직후 임대를 기록하기 전에 멈춘 워커의 작업도 만료 대상이 되도록
+            for job_id in await self._redis.lrange(self._key(kind, "processing"), 0, -1):
+                await self._redis.zadd(leases, {job_id: now + self._visibility_timeout}, nx=True)
+
+            for raw_id in await self._redis.zrangebyscore(leases, "-inf", now):
+                if not await self._redis.zrem(leases, raw_id):
+                    continue  # 다른 워커가 먼저 회수함
+                job_id = raw_id.decode()
+                attempts, priority = await self._redis.hmget(self._job_key(job_id), ["attempts", "priority"])
+                if int(attempts or 0) < self._max_attempts:
+                    await self._requeue(kind, job_id, Priority(int(priority or Priority.INTERACTIVE)))
+                else:
+                    await self._finish(kind, job_id, _failed(JobError("작업 임대 시간 초과 (재시도 소진)")))
+                count += 1
+        return count
+
+    async def depth(self) -> Dict[str, int]:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for kind in JOB_KINDS:
+                for priority in PRIORITIES:
+                    pipe.llen(self._queue_key(kind, priority))
+            lengths = iter(await pipe.execute())
+        return {kind: sum(next(lengths) for _ in PRIORITIES) for kind in JOB_KINDS}
+
+    async def close(self):
+        await self._redis.close()
+
+    async def _requeue(self, kind: str, job_id: str, priority: Priority):
+        # 다시 시도하는 작업은 같은 우선순위에서 맨 앞(오른쪽)에서 가져가도록
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._key(kind, "leases"), job_id)
+            pipe.lrem(self._key(kind, "processing"), 0, job_id)
+            pipe.rpush(self._queue_key(kind, priority), job_id)
+            self._signal_ready(pipe, kind)
+            await pipe.execute()
+
+    async def _finish(self, kind: str, job_id: str, result: dict):
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._key(kind, "leases"), job_id)
+            pipe.lrem(self._key(kind, "processing"), 0, job_id)
+            pipe.rpush(self._result_key(job_id), json.dumps(result, ensure_ascii=False))
+            pipe.expire(self._result_key(job_id), self._result_ttl)
+            pipe.delete(self._job_key(job_id))
+            await pipe.execute()
+
+
+async def _run_extract_text(job: Job) -> dict:
+    # 파싱은 CPU 작업이므로 스레드에서 실행
+    text = await asyncio.to_thread(file_parser.extract_text, job.payload["filename"], job.blob)
+    return {"text": text}
+
+
+async def _run_analyze_chunk(job: Job) -> dict:
+    words, scores = await extract_important_parts_single_chunk(job.payload["text"], Priority(job.payload["priority"]))
+    return {"words": words, "scores": scores}
+
+
+JOB_HANDLERS: Dict[str, Callable[[Job], Awaitable[dict]]] = {
+    EXTRACT_TEXT: _run_extract_text,
+    ANALYZE_CHUNK: _run_analyze_chunk,
+}
+
+
+class JobWorker:
+    """대기열에서 작업을 가져와 실행하고 결과를 돌려줍니다.
+
+    - 실행 중에는 임대 시간의 1/3마다 임대를 연장
+    - 실패하면 NON_RETRYABLE이 아닌 한 최대 시도 횟수까지 다시 대기열로
+    - 주기적으로 임대가 만료된 작업(다른 워커가 중단됨)을 회수
+    """
+
+    def __init__(self, queue, kinds: Sequence[str] = JOB_KINDS, concurrency: int = JOB_WORKER_CONCURRENCY):
+        self._queue = queue
+        self._kinds = tuple(kinds)
+        self._concurrency = concurrency
+        self._interval = max(1.0, JOB_VISIBILITY_TIMEOUT / 3)
+
+    async def run(self):
+        tasks = [asyncio.create_task(self._consume()) for _ in range(self._concurrency)]
+        tasks.append(asyncio.create_task(self._reap()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _consume(self):
+        while True:
+            try:
+                job = await self._queue.claim(self._kinds)
+            except Exception as e:
+                logger.warning(f"작업 가져오기 실패 ({e})")
+                await asyncio.sleep(CLAIM_BLOCK_SECONDS)
+                continue
+            if job is not None:
+                await self._execute(job)
+
+    async def _execute(self, job: Job):
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            with timed(f"job_{job.kind}"):
+                value = await JOB_HANDLERS[job.kind](job)
+        except asyncio.CancelledError:
+            # 워커 종료: 결과 없이 바로 다시 대기열로 (임대 만료를 기다리지 않음)
+            await asyncio.shield(self._queue.fail(job, JobError("워커 종료"), retry=True))
+            raise
+        except Exception as e:
+            requeued = await self._queue.fail(job, e, retry=not isinstance(e, NON_RETRYABLE))
+            JOBS_PROCESSED.inc(kind=job.kind, result="retry" if requeued else "error")
+            logger.warning(
+                f"작업 실패 ({job.kind} {job.id}, {job.attempts}번째 시도, "
+                f"{'재시도' if requeued else '포기'}): {e}"
+            )
+        else:
+            await self._queue.ack(job, value)
+            JOBS_PROCESSED.inc(kind=job.kind, result="ok")
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job: Job):
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self._queue.extend(job)
+            except Exception as e:
+                logger.warning(f"작업 임대 연장 실패 ({job.id}: {e})")
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                count = await self._queue.requeue_expired(self._kinds)
+            except Exception as e:
+                logger.warning(f"만료 작업 회수 실패 ({e})")
+                continue
+            if count:
+                JOBS_PROCESSED.inc(count, kind="any", result="expired")
+                logger.warning(f"임대 만료 작업 {count}개 회수")
+
+
+class JobService:
+    """API 쪽 작업 실행 진입점.
+
+    - inline: 지금처럼 요청을 받은 프로세스에서 바로 실행 (기본)
+    - memory: 프로세스 안 대기열 + 워커 (Redis 없이 작업 흐름 확인용)
+    - redis:  Redis 대기열에 넣고 별도 워커 프로세스(worker.py)의 결과를 기다림
+    Redis에 연결할 수 없으면 inline으로 동작한다.
+    """
+
+    def __init__(self, mode: str = JOB_QUEUE_MODE):
+        self.mode = mode
+        self._queue = None
+        self._worker_task: Optional[asyncio.Task] = None
+
+    async def start(self, redis_url: str):
+        if self.mode == "redis":
+            try:
+                self._queue = await RedisJobQueue.connect(redis_url)
+                logger.info(f"작업 대기열: Redis ({redis_url})")
+                warn_if_rate_limits_unshared()
+            except ImportError:
+                logger.warning("redis 패키지가 설치되지 않음, 작업을 요청 프로세스에서 바로 실행")
+                self.mode = "inline"
+            except Exception as e:
+                logger.warning(f"작업 대기열 Redis 연결 실패 ({e}), 작업을 요청 프로세스에서 바로 실행")
+                self.mode = "inline"
+        elif self.mode == "memory":
+            self._queue = MemoryJobQueue()
+            self._worker_task = asyncio.create_task(JobWorker(self._queue).run())
+
+    async def stop(self):
+        if self._worker_task:
+            self._worker_task.cancel()
+        if self._queue is not None:
+            await self._queue.close()
+
+    async def submit(self, kind: str, payload: dict, blob: bytes = b"", timeout: float = JOB_RESULT_TIMEOUT,
+                     priority: Priority = Priority.INTERACTIVE):
+        """작업을 대기열에 넣고 결과를 기다립니다. 실패하면 워커에서 난 오류를 다시 올림"""
+        with timed("job_wait"):
+            job_id = await self._queue.enqueue(kind, payload, blob, priority)
+            result = await self._queue.wait_result(job_id, timeout)
+        if result is None:
+            raise JobTimeoutError(f"작업 결과 대기 시간 초과 ({kind}, {timeout:g}초)")
+        return _unwrap(result)
+
+    async def extract_text(self, filename: str, content: bytes) -> str:
+        if self._queue is None:
+            # inline 모드에서도 파싱은 스레드에서 (업로드 중 이벤트 루프가 멈추지 않도록)
+            return await asyncio.to_thread(file_parser.extract_text, filename, content)
+        value = await self.submit(EXTRACT_TEXT, {"filename": filename}, content)
+        return value["text"]
+
+    async def analyze_chunk(self, text: str, priority: Priority = Priority.INTERACTIVE) -> Tuple[List[str], List[float]]:
+        if self._queue is None:
+            return await extract_important_parts_single_chunk(text, priority)
+        value = await self.submit(ANALYZE_CHUNK, {"text": text, "priority": int(priority)}, priority=priority)
+        return value["words"], value["scores"]
+
+    async def stats(self) -> dict:
+        stats = {"mode": self.mode}
+        if self._queue is not None:
+            try:
+                stats["queue_depth"] = await self._queue.depth()
+            except Exception as e:
+                stats["error"] = str(e)
+        return stats
+
+
+# 싱글톤 인스턴스
+jobs = JobService()
@@ -0,0 +1,232 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# 요청 처리 중인 엔드포인트 (미들웨어가 설정, CLI/워커에서는 "none")
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="none")
+
+# 요청별 단계 누적 시간(초). Server-Timing 헤더용, 요청 밖에서는 None
+request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {value:g}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """현재 값 게이지"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {value:g}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self._buckets = tuple(buckets)
+        # 라벨 조합별 [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self._buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self._buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _format_labels(self.label_names, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    "heatmap_http_request_duration_seconds", "엔드포인트별 요청 처리 시간", ("endpoint", "method", "status"),
+))
+STAGE_SECONDS = registry.register(Histogram(
+    "heatmap_stage_duration_seconds", "단계별 처리 시간 (parse, chunk, cache, llm, match)", ("stage", "endpoint"),
+))
+CACHE_REQUESTS = registry.register(Counter(
+    "heatmap_cache_requests_total", "캐시 조회 결과 (result: hit, miss, stale)", ("namespace", "tier", "result"),
+))
+CACHE_REFRESHES = registry.register(Counter(
+    "heatmap_cache_refreshes_total", "백그라운드 캐시 갱신 (reason: stale, early / result: ok, error, skipped)",
+    ("namespace", "reason", "result"),
+))
+PARSE_BOILERPLATE_CHARS = registry.register(Counter(
+    "heatmap_parse_boilerplate_chars_total", "PDF 추출 시 제거한 반복 머리글/바닥글/쪽번호 문자 수",
+))
+UPSTREAM_INFLIGHT = registry.register(Gauge(
+    "heatmap_upstream_inflight", "진행 중인 업스트림 호출 수",
+))
+UPSTREAM_QUEUE_DEPTH = registry.register(Gauge(
+    "heatmap_upstream_queue_depth", "업스트림 호출 대기열 길이",
+))
+UPSTREAM_INFLIGHT.set(0)
+UPSTREAM_QUEUE_DEPTH.set(0)
+ADMISSION_INFLIGHT = registry.register(Gauge(
+    "heatmap_admission_inflight", "입장 제어를 통과해 처리 중인 요청 수", ("route_class",),
+))
+ADMISSION_QUEUE_DEPTH = registry.register(Gauge(
+    "heatmap_admission_queue_depth", "입장 대기열 길이", ("route_class",),
+))
+ADMISSION_REJECTIONS = registry.register(Counter(
+    "heatmap_admission_rejections_total", "입장 거절 수 (reason: queue_full, estimated_wait, timeout)",
+    ("route_class", "reason"),
+))
+WS_CONNECTIONS = registry.register(Gauge(
+    "heatmap_ws_connections", "열려 있는 읽기 세션 WebSocket 수",
+))
+WS_CONNECTIONS.set(0)
+WS_MESSAGES = registry.register(Counter(
+    "heatmap_ws_messages_total", "읽기 세션 메시지 수 (result: ok, error, pushed)", ("type", "result"),
+))
+JOBS_PROCESSED = registry.register(Counter(
+    "heatmap_jobs_total", "워커 작업 처리 결과 (result: ok, retry, error, expired)", ("kind", "result"),
+))
+UPSTREAM_ERRORS = registry.register(Counter(
+    "heatmap_upstream_errors_total", "업스트림 오류 수 (status: HTTP 코드, timeout, connection)", ("status",),
+))
+UPSTREAM_TOKENS = registry.register(Counter(
+    "heatmap_upstream_tokens_total", "메시지 usage 기준 토큰 수", ("direction",),
+))
+UPSTREAM_HEDGES = registry.register(Counter(
+    "heatmap_upstream_hedges_total", "헤징 호출 수 (result: fired, won)", ("result",),
+))
+
+
+def cache_namespace(key: str) -> str:
+    """캐시 키의 네임스페이스 (analyze:..., translate:word:... 등)"""
+    parts = key.split(":", 2)
+    if parts[0] == "translate" and len(parts) > 1:
+        return f"translate:{parts[1]}"
+    return parts[0]
+
+
+@contextmanager
+def timed(stage: str, endpoint: Optional[str] = None):
+    """블록(또는 데코레이터로 감싼 동기 함수)의 실행 시간을 단계별로 기록합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage, endpoint=endpoint or current_endpoint.get())
+        timings = request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def format_server_timing(timings: Dict[str, float], total: float) -> str:
+    """Server-Timing 헤더 값 (단위: ms)"""
+    entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
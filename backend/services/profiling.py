@@ -0,0 +1,114 @@
+import asyncio
+import cProfile
+import hmac
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+from config import ADMIN_TOKEN
+
+try:
+    # 샘플링 프로파일러 (선택, pip install ".[profiling]"). 없으면 모든 호출을 추적하는 cProfile 사용
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:
+    SamplingProfiler = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOP_FUNCTIONS = 40
+MEMORY_TOP_ALLOCATIONS = 20
+
+# 프로파일러/tracemalloc은 프로세스 전역이므로 한 번에 한 요청만
+_profile_lock = asyncio.Lock()
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """관리자 토큰 확인 (ADMIN_TOKEN 미설정 시 항상 거부)"""
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def make_profile_key(profile_id: str) -> str:
+    """프로파일 캐시 키 생성"""
+    return f"profile:{profile_id}"
+
+
+class ProfileSession:
+    """한 요청 동안 CPU 프로파일과 메모리 할당을 기록합니다."""
+
+    def __init__(self, path: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.path = path
+        self.result: Optional[dict] = None
+
+    def to_json(self) -> str:
+        return json.dumps(self.result, ensure_ascii=False)
+
+
+@asynccontextmanager
+async def profile_request(path: str):
+    """블록 실행을 프로파일링합니다. 다른 프로파일이 진행 중이면 None을 돌려주고 그냥 실행.
+
+    이벤트 루프 스레드 전체를 기록하므로 같은 시간에 처리된 다른 요청도 섞일 수 있다.
+    반대로 asyncio.to_thread로 넘긴 작업(파일 텍스트 추출, 빠른 점수 계산, WebSocket 세션의
+    청크 분할)과 작업 대기열 워커 프로세스는 기록되지 않는다. CPU 보고서에는 해당 await의
+    대기 시간만 보인다. HTTP 엔드포인트의 청크 분할은 이벤트 루프에서 실행되므로 기록된다.
+    메모리(tracemalloc)는 프로세스 전역이라 스레드 할당도 포함된다.
+    """
+    if _profile_lock.locked():
+        yield None
+        return
+
+    async with _profile_lock:
+        session = ProfileSession(path)
+
+        if SamplingProfiler is not None:
+            profiler = SamplingProfiler(async_mode="disabled")
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        tracemalloc.start()
+        started = time.perf_counter()
+
+        try:
+            yield session
+        finally:
+            duration = time.perf_counter() - started
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            if SamplingProfiler is not None:
+                profiler.stop()
+                cpu_report = profiler.output_text(unicode=True, color=False)
+                profiler_name = "pyinstrument"
+            else:
+                profiler.disable()
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+                cpu_report = stream.getvalue()
+                profiler_name = "cProfile"
+
+            top_allocations = [
+                {"location": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:MEMORY_TOP_ALLOCATIONS]
+            ]
+
+            session.result = {
+                "id": session.id,
+                "path": path,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "duration_ms": round(duration * 1000, 2),
+                "profiler": profiler_name,
+                "cpu_scope": "event_loop_thread",  # 추출/빠른 점수/세션 청크 분할(to_thread)과 워커 프로세스는 제외
+                "cpu": cpu_report,
+                "memory": {"peak_kb": round(peak / 1024, 1), "top": top_allocations},
+            }
+            logger.info(f"요청 프로파일 기록: {path} ({session.id}, {duration * 1000:.0f}ms)")
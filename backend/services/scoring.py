@@ -0,0 +1,207 @@
+import asyncio
+import math
+import re
+from collections import Counter
+from typing import List, Tuple, Protocol
+from services.extraction import split_into_words
+from services.jobs import jobs
+from services.upstream import Priority
+from services.metrics import timed
+
+_numpy = None
+_numpy_loaded = False
+
+
+def _load_numpy():
+    """numpy를 처음 사용할 때 로드합니다. 없으면 None (순수 파이썬으로 계산)"""
+    global _numpy, _numpy_loaded
+    if not _numpy_loaded:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+        _numpy_loaded = True
+    return _numpy
+
+SENTENCE_END = ('.', '!', '?', '。', '…', '"', '”', '’')
+
+TOKEN_PATTERN = re.compile(r"[\w']+", re.UNICODE)
+
+# 빠른 점수 계산에서 강조할 문장 비율과 점수 구간 (LLM 점수 기준과 동일한 0.5~1.0)
+FAST_TOP_RATIO = 0.3
+FAST_MIN_SCORE = 0.5
+FAST_MAX_SCORE = 1.0
+
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 30
+# 유사도 그래프 하나에 넣을 최대 문장 수. 넘으면 연속 구간으로 나눠 따로 계산
+# (순수 파이썬 계산은 문장 수의 제곱에 비례하므로 긴 문서에서도 시간을 제한)
+TEXTRANK_MAX_SENTENCES = 100
+
+
+class Scorer(Protocol):
+    """텍스트를 (words, scores)로 변환하는 점수 엔진 인터페이스"""
+
+    name: str
+
+    async def score(self, text: str, priority: Priority = Priority.INTERACTIVE) -> Tuple[List[str], List[float]]:
+        ...
+
+
+class LLMScorer:
+    """Haiku 기반 점수 엔진 (기본)"""
+
+    name = "llm"
+
+    async def score(self, text: str, priority: Priority = Priority.INTERACTIVE) -> Tuple[List[str], List[float]]:
+        # 작업 대기열 모드면 워커 프로세스에서 분석
+        return await jobs.analyze_chunk(text, priority)
+
+
+class FastScorer:
+    """CPU만 사용하는 추출 요약 점수 엔진 (TF-IDF + TextRank 문장 순위).
+
+    API 호출 없이 LLM과 같은 words/scores 형태를 만든다. 청크 하나는 numpy가 있으면
+    수 밀리초, 순수 파이썬이면 수십~수백 밀리초이므로 이벤트 루프를 막지 않도록 스레드에서 계산.
+    """
+
+    name = "fast"
+
+    async def score(self, text: str, priority: Priority = Priority.INTERACTIVE) -> Tuple[List[str], List[float]]:
+        with timed("fast_score"):
+            return await asyncio.to_thread(score_text_fast, text)
+
+
+def _split_sentences(words: List[str]) -> List[Tuple[int, int]]:
+    """단어 리스트를 문장 단위 (시작, 끝) 인덱스 구간으로 나눕니다."""
+    spans = []
+    start = None
+
+    for i, word in enumerate(words):
+        if word == '\n':
+            if start is not None:
+                spans.append((start, i))
+                start = None
+            continue
+
+        if start is None:
+            start = i
+        if word.endswith(SENTENCE_END):
+            spans.append((start, i + 1))
+            start = None
+
+    if start is not None:
+        spans.append((start, len(words)))
+
+    return spans
+
+
+def _textrank(vectors: List[Counter]) -> List[float]:
+    """문장 TF-IDF 벡터의 코사인 유사도 그래프에서 PageRank 점수를 계산합니다."""
+    n = len(vectors)
+    vocab = {}
+    for vec in vectors:
+        for term in vec:
+            vocab.setdefault(term, len(vocab))
+
+    np = _load_numpy()
+    if np is not None:
+        matrix = np.zeros((n, len(vocab)))
+        for i, vec in enumerate(vectors):
+            for term, weight in vec.items():
+                matrix[i, vocab[term]] = weight
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        matrix /= norms[:, None]
+
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0.0)
+        row_sums = similarity.sum(axis=1)
+        row_sums[row_sums == 0] = 1.0
+        transition = similarity / row_sums[:, None]
+
+        ranks = np.full(n, 1.0 / n)
+        for _ in range(TEXTRANK_ITERATIONS):
+            ranks = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (transition.T @ ranks)
+        return ranks.tolist()
+
+    # numpy 없을 때: 같은 계산을 순수 파이썬으로
+    norms = [math.sqrt(sum(w * w for w in vec.values())) or 1.0 for vec in vectors]
+    similarity = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            small, large = (vectors[i], vectors[j]) if len(vectors[i]) < len(vectors[j]) else (vectors[j], vectors[i])
+            dot = sum(w * large.get(t, 0.0) for t, w in small.items())
+            similarity[i][j] = similarity[j][i] = dot / (norms[i] * norms[j])
+    row_sums = [sum(row) or 1.0 for row in similarity]
+
+    ranks = [1.0 / n] * n
+    for _ in range(TEXTRANK_ITERATIONS):
+        ranks = [
+            (1 - TEXTRANK_DAMPING) / n
+            + TEXTRANK_DAMPING * sum(similarity[j][i] / row_sums[j] * ranks[j] for j in range(n))
+            for i in range(n)
+        ]
+    return ranks
+
+
+def score_text_fast(text: str) -> Tuple[List[str], List[float]]:
+    """TF-IDF 가중 TextRank로 상위 문장을 골라 단어별 점수를 만듭니다."""
+    words = split_into_words(text)
+    scores = [0.0] * len(words)
+
+    spans = _split_sentences(words)
+    if not spans:
+        return words, scores
+
+    # 문장별 용어 빈도 (2자 미만 토큰은 제외)
+    term_counts = []
+    for start, end in spans:
+        terms = TOKEN_PATTERN.findall(" ".join(words[start:end]).lower())
+        term_counts.append(Counter(t for t in terms if len(t) >= 2))
+
+    # 문장을 문서로 보는 IDF
+    document_freq = Counter()
+    for counts in term_counts:
+        document_freq.update(counts.keys())
+    n = len(spans)
+    vectors = [
+        Counter({t: c * (math.log((1 + n) / (1 + document_freq[t])) + 1) for t, c in counts.items()})
+        for counts in term_counts
+    ]
+
+    # 구간별 순위는 합이 1이므로 구간 길이를 곱해 평균 1로 맞춘 뒤 비교
+    ranks = []
+    for block_start in range(0, n, TEXTRANK_MAX_SENTENCES):
+        block = vectors[block_start:block_start + TEXTRANK_MAX_SENTENCES]
+        block_ranks = _textrank(block) if len(block) > 1 else [1.0 / len(block)]
+        ranks.extend(rank * len(block) for rank in block_ranks)
+
+    # 너무 짧은 문장(5단어 미만)은 LLM 기준과 마찬가지로 강조하지 않음
+    candidates = [i for i, (start, end) in enumerate(spans) if end - start >= 5] or list(range(n))
+    candidates.sort(key=lambda i: round(ranks[i], 9), reverse=True)
+    selected = candidates[:max(1, math.ceil(n * FAST_TOP_RATIO))]
+
+    top, bottom = ranks[selected[0]], ranks[selected[-1]]
+    for i in selected:
+        ratio = (ranks[i] - bottom) / (top - bottom) if top > bottom else 1.0
+        score = round(FAST_MIN_SCORE + (FAST_MAX_SCORE - FAST_MIN_SCORE) * ratio, 2)
+        start, end = spans[i]
+        for idx in range(start, end):
+            scores[idx] = score
+
+    return words, scores
+
+
+_SCORERS = {
+    LLMScorer.name: LLMScorer(),
+    FastScorer.name: FastScorer(),
+}
+
+
+def get_scorer(mode: str) -> Scorer:
+    """mode 이름으로 점수 엔진을 반환합니다."""
+    if mode not in _SCORERS:
+        raise ValueError(f"지원하지 않는 분석 모드입니다: {mode}")
+    return _SCORERS[mode]
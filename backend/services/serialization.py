@@ -0,0 +1,52 @@
+import json
+from typing import Any, Dict, Optional
+from starlette.responses import Response
+from services.metrics import timed
+
+try:
+    # 고성능 JSON 인코더 (선택). 없으면 표준 json 사용
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def dumps(obj: Any) -> str:
+    """캐시 저장용 JSON 문자열"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """응답 본문용 JSON 바이트"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(payload: dict, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """pydantic 검증/재직렬화 없이 dict를 바로 JSON 응답으로 만듭니다."""
+    with timed("serialize"):
+        body = dumps_bytes(payload)
+    return Response(content=body, status_code=status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
+
+
+def patch_json_object(serialized: str, **fields: Any) -> bytes:
+    """직렬화된 JSON 객체 문자열 끝에 필드를 덧붙입니다. (역직렬화 없이 cached 등 추가)"""
+    body = serialized.rstrip()
+    if not body.endswith("}"):
+        raise ValueError("JSON 객체가 아닙니다.")
+
+    extra = ",".join(f"{dumps(name)}:{dumps(value)}" for name, value in fields.items())
+    head = body[:-1].rstrip()
+    separator = "" if head.endswith("{") or not extra else ","
+    return (head + separator + extra + "}").encode("utf-8")
+
+
+def cached_json_response(serialized: str, headers: Optional[Dict[str, str]] = None, **fields: Any) -> Response:
+    """캐시에 저장된 JSON 문자열을 그대로 응답 본문으로 사용합니다."""
+    with timed("serialize"):
+        body = patch_json_object(serialized, **fields)
+    return Response(content=body, headers=headers, media_type=JSON_MEDIA_TYPE)
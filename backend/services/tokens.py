@@ -0,0 +1,111 @@
+import re
+from array import array
+from typing import Dict, List
+
+# 줄바꿈은 별도 토큰, 나머지는 공백으로 구분한 단어 (split_into_words와 같은 분리)
+TOKEN_PATTERN = re.compile(r'\n|\S+')
+
+# 매칭 시 단어 앞뒤에서 제거하는 문장 부호
+STRIP_CHARS = '.,!?"\';:()[]{}'
+
+NEWLINE = '\n'
+NEWLINE_ID = 0  # vocab[0]은 줄바꿈 토큰 전용
+
+WHITESPACE = re.compile(r'\s')
+TOKENIZE_WINDOW = 8192  # tokenize가 한 번에 findall하는 문자 수
+
+
+def normalize_token(word: str) -> str:
+    """매칭 비교용 형태 (소문자, 앞뒤 문장 부호 제거)"""
+    return word.lower().strip(STRIP_CHARS)
+
+
+class TokenTable:
+    """텍스트를 한 번 훑어 만든 토큰 표.
+
+    - raw_ids: 토큰별 원문 형태 번호 (array, 토큰당 4바이트), raw[raw_id]가 원문 형태 ("Cat," 등)
+    - raw_forms[raw_id]: 원문 형태의 정규화 형태 번호, vocab[id]가 정규화 형태 ("cat")
+    문자열은 서로 다른 형태마다 하나만 저장한다.
+    같은 정규화 형태는 한 번만 저장하므로 비교는 형태 수만큼만 하면 된다.
+    단어 문자열 리스트(words)는 API 응답 등 호환용으로만 만든다.
+    """
+
+    __slots__ = ("raw_ids", "raw", "raw_forms", "vocab")
+
+    def __init__(self, raw_ids: array, raw: List[str], raw_forms: List[int], vocab: List[str]):
+        self.raw_ids = raw_ids
+        self.raw = raw
+        self.raw_forms = raw_forms
+        self.vocab = vocab
+
+    def __len__(self) -> int:
+        return len(self.raw_ids)
+
+    @property
+    def ids(self) -> array:
+        """토큰별 정규화 형태 번호 (호출할 때마다 새로 만듦)"""
+        return array('I', list(map(self.raw_forms.__getitem__, self.raw_ids)))
+
+    def word(self, index: int) -> str:
+        return self.raw[self.raw_ids[index]]
+
+    def words(self) -> List[str]:
+        """split_into_words 형태의 단어 리스트 (줄바꿈은 '\\n' 토큰, 같은 형태는 같은 문자열 객체)"""
+        return list(map(self.raw.__getitem__, self.raw_ids))
+
+    @classmethod
+    def from_words(cls, words: List[str]) -> "TokenTable":
+        """이미 분리된 단어 리스트로 표를 만듭니다."""
+        vocab = _Vocab()
+        return vocab.table(array('I', list(map(vocab.__getitem__, words))))
+
+
+class _Vocab(dict):
+    """원문 형태 → 원문 형태 id. 처음 나온 형태만 정규화하여 정규화 형태 id를 정한다.
+
+    dict 조회가 그대로 id 조회이므로 map(vocab.__getitem__, words)로 쓸 수 있다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self[NEWLINE] = NEWLINE_ID
+        self.raw = [NEWLINE]
+        self.raw_forms = [NEWLINE_ID]  # 원문 형태 id → 정규화 형태 id
+        self.forms = [NEWLINE]
+        self._form_ids: Dict[str, int] = {}
+
+    def __missing__(self, word: str) -> int:
+        form = normalize_token(word)
+        form_id = self._form_ids.get(form)
+        if form_id is None:
+            form_id = self._form_ids[form] = len(self.forms)
+            self.forms.append(form)
+        raw_id = self[word] = len(self.raw)
+        self.raw.append(word)
+        self.raw_forms.append(form_id)
+        return raw_id
+
+    def table(self, raw_ids: array) -> TokenTable:
+        return TokenTable(raw_ids, self.raw, self.raw_forms, self.forms)
+
+
+def tokenize(text: str) -> TokenTable:
+    """컴파일된 정규식(findall)으로 텍스트를 앞에서부터 한 번 훑어 토큰 표로 만듭니다.
+
+    TOKENIZE_WINDOW자씩 공백 경계에서 끊어 findall하므로 토큰 문자열은 구간 하나 분량만
+    잠시 만들어졌다가 사라지고, 남는 것은 형태 id array와 서로 다른 형태 문자열뿐이다.
+    """
+    vocab = _Vocab()
+    lookup = vocab.__getitem__
+    raw_ids = array('I')
+    position, length = 0, len(text)
+    while position < length:
+        end = length
+        if position + TOKENIZE_WINDOW < length:
+            # 공백 위치에서 끊으면 토큰이 두 구간에 걸치지 않음 (줄바꿈은 다음 구간의 첫 토큰)
+            boundary = WHITESPACE.search(text, position + TOKENIZE_WINDOW)
+            if boundary is not None:
+                end = boundary.start()
+        raw_ids.fromlist(list(map(lookup, TOKEN_PATTERN.findall(text, position, end))))
+        position = end
+    return vocab.table(raw_ids)
@@ -0,0 +1,94 @@
+import json
+from typing import Awaitable, Callable, Optional, Tuple
+from fastapi import HTTPException
+from config import ANTHROPIC_API_KEY, HAIKU_MODEL, CACHE_TTL_TRANSLATE, CACHE_STALE_TTL, UPSTREAM_TIMEOUT_TRANSLATE
+from services.admission import admission, AdmissionRejected
+from services.cache import cache, CacheService
+from services.dictionary import hot_dictionary, normalize_word
+from services.metrics import CACHE_REQUESTS
+from services.serialization import dumps
+from services.upstream import scheduler, Priority, UpstreamTimeoutError
+
+# 번역 종류별 프롬프트와 최대 출력 토큰
+PROMPTS = {
+    "word": ("""영어 단어 "{text}"의 한글 뜻을 한 단어로만 답변하세요. 설명, 품사, 화살표 없이 한글만.""", 100),
+    "sentence": ("""다음 영어 문장을 한글로 자연스럽게 번역해주세요. 번역문만 답변하세요.
+
+문장: {text}""", 500),
+    "paragraph": ("""다음 영어 문단을 한글로 자연스럽게 번역해주세요. 번역문만 답변하세요.
+
+문단: {text}""", 1000),
+}
+
+
+async def _translate(prompt: str, max_tokens: int, kind: str, priority: Priority = Priority.INTERACTIVE) -> str:
+    message = await scheduler.create(
+        priority=priority,
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": prompt}],
+        timeout=UPSTREAM_TIMEOUT_TRANSLATE,
+        kind=kind,
+    )
+    return message.content[0].text.strip()
+
+
+def _refresh_translation(prompt: str, max_tokens: int, kind: str) -> Callable[[], Awaitable[Optional[str]]]:
+    """만료된 번역 캐시 갱신용 (미리 읽기 우선순위)"""
+    async def refresh() -> Optional[str]:
+        translation = await _translate(prompt, max_tokens, kind, Priority.PREFETCH)
+        return dumps({"translation": translation})
+    return refresh
+
+
+def translation_key(kind: str, text: str) -> Tuple[str, str]:
+    """(캐시 키, 모델에 보낼 텍스트). 단어는 "Running", "running," 등을 같은 키로 정규화
+    (문장 부호만 있으면 원문 그대로)"""
+    if kind == "word":
+        text = normalize_word(text) or text
+    return CacheService.make_translate_key(kind, HAIKU_MODEL, text), text
+
+
+async def translate(kind: str, source: str, cache_key: str) -> Tuple[str, bool]:
+    """번역문과 캐시 적중 여부를 반환합니다. HTTP/WebSocket 공용.
+
+    핫 사전(단어) → 캐시 → (캐시에 없을 때만) 입장 제어 → 모델 호출 → 캐시 저장.
+    source/cache_key는 translation_key()의 결과.
+    """
+    if kind == "word":
+        # 핫 사전: Redis/모델 없이 프로세스 메모리에서 바로 응답
+        translation = hot_dictionary.get(source)
+        if translation is not None:
+            CACHE_REQUESTS.inc(namespace="translate:word", tier="hot", result="hit")
+            return translation, True
+
+    if not ANTHROPIC_API_KEY:
+        raise ValueError("API 키가 설정되지 않았습니다.")
+
+    template, max_tokens = PROMPTS[kind]
+    prompt = template.format(text=source)
+    call_kind = f"translate_{kind}"
+
+    # 캐시 확인 (만료된 값은 바로 반환하고 백그라운드에서 갱신)
+    cached_result = await cache.get_or_refresh(
+        cache_key, CACHE_TTL_TRANSLATE, _refresh_translation(prompt, max_tokens, call_kind)
+    )
+    if cached_result:
+        return json.loads(cached_result)["translation"], True
+
+    async with admission.slot("translate"):
+        translation = await _translate(prompt, max_tokens, call_kind)
+
+    # 캐시 저장
+    await cache.set(cache_key, dumps({"translation": translation}), CACHE_TTL_TRANSLATE, CACHE_STALE_TTL)
+    return translation, False
+
+
+def translation_http_error(error: Exception) -> Exception:
+    """번역 오류를 HTTP 오류로 바꿉니다. (입장 거절은 503 처리기로 그대로 전달)"""
+    if isinstance(error, (HTTPException, AdmissionRejected)):
+        return error
+    if isinstance(error, UpstreamTimeoutError):
+        return HTTPException(status_code=504, detail=str(error))
+    if isinstance(error, ValueError):
+        return HTTPException(status_code=500, detail=str(error))
+    return HTTPException(status_code=500, detail=f"번역 중 오류: {str(error)}")
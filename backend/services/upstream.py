@@ -0,0 +1,403 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Dict, List, Optional
+from config import (
+    ANTHROPIC_API_KEY,
+    ANTHROPIC_BASE_URL,
+    HAIKU_MODEL,
+    UPSTREAM_RPM,
+    UPSTREAM_TPM,
+    UPSTREAM_PROCESSES,
+    UPSTREAM_MAX_CONCURRENCY,
+    UPSTREAM_MAX_RETRIES,
+    UPSTREAM_HEDGE_MAX_RATIO,
+)
+from services.metrics import (
+    timed,
+    UPSTREAM_INFLIGHT,
+    UPSTREAM_QUEUE_DEPTH,
+    UPSTREAM_ERRORS,
+    UPSTREAM_TOKENS,
+    UPSTREAM_HEDGES,
+)
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 상태 코드 (429: rate limit, 529: overloaded)
+RETRYABLE_STATUS = {429, 529}
+
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+LATENCY_WINDOW = 200     # p95 계산에 사용할 최근 호출 수
+HEDGE_MIN_SAMPLES = 20   # 헤징을 시작하기 위한 최소 표본 수
+HEDGE_BUDGET_CAP = 10.0  # 누적 가능한 헤징 예산 (한꺼번에 몰리는 것 방지)
+
+WARM_TIMEOUT = 10.0      # 사전 연결 요청 제한 시간(초)
+
+
+class UpstreamTimeoutError(TimeoutError):
+    """업스트림 호출이 제한 시간 안에 끝나지 않음"""
+
+
+class Priority(IntEnum):
+    """업스트림 호출 우선순위 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0  # /api/analyze, 번역 등 사용자가 기다리는 요청
+    PREFETCH = 1     # 다음 청크 미리 분석
+    BULK = 2         # 대량 분석 CLI
+
+
+class TokenBucket:
+    """분당 한도를 초 단위로 보충하는 토큰 버킷. rate가 0 이하면 무제한."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self._tokens = self.capacity
+        self._rate = self.capacity / 60
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount만큼 소비하려면 기다려야 하는 시간(초)"""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        # 한 번에 용량보다 큰 요청은 가득 찼을 때 허용
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self._rate
+
+    def consume(self, amount: float):
+        if not self.unlimited:
+            self._refill()
+            self._tokens -= amount
+
+    def drain(self):
+        """429를 받으면 남은 토큰을 비워 다른 요청도 함께 늦춤"""
+        if not self.unlimited:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+
+def _percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def estimate_tokens(text: str) -> int:
+    """문자 수 기반 대략적인 토큰 수 (한글 비중을 고려해 3자당 1토큰)"""
+    return len(text) // 3 + 1
+
+
+class UpstreamScheduler:
+    """모든 Haiku 호출을 통과시키는 스케줄러.
+
+    - RPM/TPM 토큰 버킷으로 계정 한도 이내로 호출. 버킷은 프로세스별이므로 계정 한도를
+      processes(API 서버 + 워커 프로세스 수)로 나눈 몫만 사용
+    - 동시 호출 수 제한, 대기열은 우선순위 순서로 처리
+    - 429/529 응답은 지터가 포함된 지수 백오프로 재시도
+    - 호출당 제한 시간, p95를 넘긴 호출은 비용 한도 내에서 헤징
+    """
+
+    def __init__(
+        self,
+        rpm: int = UPSTREAM_RPM,
+        tpm: int = UPSTREAM_TPM,
+        max_concurrency: int = UPSTREAM_MAX_CONCURRENCY,
+        max_retries: int = UPSTREAM_MAX_RETRIES,
+        hedge_max_ratio: float = UPSTREAM_HEDGE_MAX_RATIO,
+        processes: int = UPSTREAM_PROCESSES,
+    ):
+        self.processes = processes
+        self._requests = TokenBucket(rpm / processes)
+        self._tokens = TokenBucket(tpm / processes)
+        self._max_concurrency = max_concurrency
+        self._max_retries = max_retries
+
+        self._client = None
+        self._waiters: list = []  # (priority, seq, tokens, future)
+        self._seq = itertools.count()
+        self._inflight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # 지연 시간 / 헤징 통계
+        self._latencies: Dict[str, deque] = {}
+        self._hedge_max_ratio = hedge_max_ratio
+        self._hedge_budget = 0.0
+        self._calls = 0
+        self._timeouts = 0
+        self._hedges_fired = 0
+        self._hedges_won = 0
+
+    def _get_client(self):
+        if not ANTHROPIC_API_KEY:
+            raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다.")
+        if self._client is None:
+            # anthropic SDK는 import만 1초 이상 걸리므로 첫 호출 때 로드
+            import anthropic
+
+            # 재시도는 스케줄러가 직접 관리
+            self._client = anthropic.AsyncAnthropic(
+                api_key=ANTHROPIC_API_KEY,
+                base_url=ANTHROPIC_BASE_URL,
+                max_retries=0,
+            )
+        return self._client
+
+    async def warm(self):
+        """SDK 로드와 클라이언트 생성, 첫 연결(TLS 핸드셰이크)을 미리 해 둡니다. 토큰은 쓰지 않음."""
+        client = await asyncio.to_thread(self._get_client)
+        try:
+            await asyncio.wait_for(client.models.list(limit=1), WARM_TIMEOUT)
+        except Exception as e:
+            # 연결 풀만 데워지면 되므로 응답 오류는 무시
+            logger.debug(f"업스트림 사전 연결 응답 무시: {e}")
+
+    async def create(
+        self,
+        messages: List[dict],
+        max_tokens: int,
+        priority: Priority = Priority.INTERACTIVE,
+        model: str = HAIKU_MODEL,
+        timeout: Optional[float] = None,
+        kind: str = "default",
+    ):
+        """messages.create를 한도/우선순위에 맞춰 호출하고 Message를 반환합니다.
+
+        timeout: 업스트림 호출 1회당 제한 시간(초). 초과 시 UpstreamTimeoutError.
+        kind: 지연 시간 통계를 나눌 호출 종류 (헤징 기준 p95 계산용)
+        """
+        client = self._get_client()
+        prompt_chars = "".join(m["content"] for m in messages if isinstance(m.get("content"), str))
+        reserved = estimate_tokens(prompt_chars) + max_tokens
+        kwargs = {"model": model, "max_tokens": max_tokens, "messages": messages}
+
+        self._calls += 1
+        self._hedge_budget = min(HEDGE_BUDGET_CAP, self._hedge_budget + self._hedge_max_ratio)
+
+        with timed("llm"):
+            return await self._create_with_retry(client, kwargs, priority, reserved, timeout, kind)
+
+    async def _create_with_retry(self, client, kwargs: dict, priority: Priority, reserved: int,
+                                 timeout: Optional[float], kind: str):
+        import anthropic
+
+        for attempt in range(self._max_retries + 1):
+            try:
+                return await self._hedged_call(client, kwargs, priority, reserved, timeout, kind)
+            except anthropic.APIStatusError as e:
+                if e.status_code not in RETRYABLE_STATUS or attempt >= self._max_retries:
+                    raise
+                delay = self._backoff_delay(attempt, e.response.headers.get("retry-after"))
+                if e.status_code == 429:
+                    self._requests.drain()
+                    self._tokens.drain()
+                logger.warning(
+                    f"업스트림 {e.status_code} 응답, {delay:.1f}초 후 재시도 "
+                    f"({attempt + 1}/{self._max_retries}, 우선순위 {priority.name})"
+                )
+
+            await asyncio.sleep(delay)
+
+    async def _hedged_call(self, client, kwargs: dict, priority: Priority, reserved: int,
+                           timeout: Optional[float], kind: str):
+        """1차 호출이 관측 p95 안에 끝나지 않으면 중복 호출을 보내 먼저 끝난 쪽을 사용"""
+        started = asyncio.Event()
+        primary = asyncio.create_task(
+            self._call_once(client, kwargs, priority, reserved, timeout, kind, started)
+        )
+        hedge_delay = self._hedge_delay(kind)
+        pending = {primary}
+        try:
+            if hedge_delay is None:
+                return await primary
+
+            # 대기열 시간은 제외하고, 실제 호출이 시작된 시점부터 p95를 잰다
+            started_wait = asyncio.create_task(started.wait())
+            await asyncio.wait({primary, started_wait}, return_when=asyncio.FIRST_COMPLETED)
+            started_wait.cancel()
+            if not primary.done():
+                await asyncio.wait({primary}, timeout=hedge_delay)
+            if primary.done() or self._hedge_budget < 1:
+                return await primary
+
+            self._hedge_budget -= 1
+            self._hedges_fired += 1
+            UPSTREAM_HEDGES.inc(result="fired")
+            logger.info(f"헤징 호출 발사 ({kind}, {hedge_delay:.1f}초 경과)")
+            hedge = asyncio.create_task(
+                self._call_once(client, kwargs, priority, reserved, timeout, kind)
+            )
+            pending = {primary, hedge}
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedges_won += 1
+                            UPSTREAM_HEDGES.inc(result="won")
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call_once(self, client, kwargs: dict, priority: Priority, reserved: int,
+                         timeout: Optional[float], kind: str, started: Optional[asyncio.Event] = None):
+        import anthropic
+
+        await self._acquire(priority, reserved)
+        if started is not None:
+            started.set()
+        call_started = time.monotonic()
+        try:
+            message = await asyncio.wait_for(client.messages.create(**kwargs), timeout)
+        except asyncio.CancelledError:
+            # 헤징에서 진 호출: 끝까지 가지 않았으므로 지연 시간 표본에서 제외
+            raise
+        except asyncio.TimeoutError:
+            self._record_latency(kind, call_started)
+            self._timeouts += 1
+            UPSTREAM_ERRORS.inc(status="timeout")
+            raise UpstreamTimeoutError(f"업스트림 응답 시간 초과 ({timeout:g}초)")
+        except anthropic.APIStatusError as e:
+            self._record_latency(kind, call_started)
+            UPSTREAM_ERRORS.inc(status=str(e.status_code))
+            raise
+        except anthropic.APIConnectionError:
+            self._record_latency(kind, call_started)
+            UPSTREAM_ERRORS.inc(status="connection")
+            raise
+        finally:
+            self._release()
+
+        self._record_latency(kind, call_started)
+
+        # 실제 사용량으로 예약분 정산
+        usage = getattr(message, "usage", None)
+        if usage is not None:
+            actual = usage.input_tokens + usage.output_tokens
+            self._tokens.consume(actual - reserved)
+            UPSTREAM_TOKENS.inc(usage.input_tokens, direction="input")
+            UPSTREAM_TOKENS.inc(usage.output_tokens, direction="output")
+        return message
+
+    def _record_latency(self, kind: str, call_started: float):
+        """성공/오류/시간 초과 모두 기록 (성공만 모으면 p95가 낮게 잡혀 헤징이 잦아짐)"""
+        self._latencies.setdefault(kind, deque(maxlen=LATENCY_WINDOW)).append(time.monotonic() - call_started)
+
+    def _hedge_delay(self, kind: str) -> Optional[float]:
+        """헤징 대기 시간 (관측 p95). 비활성화되었거나 표본이 부족하면 None"""
+        if self._hedge_max_ratio <= 0:
+            return None
+        samples = self._latencies.get(kind)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return _percentile(samples, 0.95)
+
+    @staticmethod
+    def _backoff_delay(attempt: int, retry_after: Optional[str]) -> float:
+        """Retry-After가 있으면 따르고, 없으면 full jitter 지수 백오프"""
+        jitter = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+        if retry_after:
+            try:
+                return float(retry_after) + jitter * 0.1
+            except ValueError:
+                pass
+        return jitter
+
+    async def _acquire(self, priority: Priority, tokens: int):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 허가를 받은 직후 취소되었다면 자리를 반납
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        self._inflight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """대기열 맨 앞(가장 높은 우선순위)부터 한도가 허락하는 만큼 허가"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        try:
+            self._grant()
+        finally:
+            UPSTREAM_INFLIGHT.set(self._inflight)
+            UPSTREAM_QUEUE_DEPTH.set(self.queue_depth)
+
+    def _grant(self):
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._inflight >= self._max_concurrency:
+                return
+
+            wait = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            self._requests.consume(1)
+            self._tokens.consume(tokens)
+            self._inflight += 1
+            future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "rpm_limit": self._requests.capacity,
+            "tpm_limit": self._tokens.capacity,
+            "processes": self.processes,
+            "inflight": self._inflight,
+            "queue_depth": self.queue_depth,
+            "calls": self._calls,
+            "timeouts": self._timeouts,
+            "hedges_fired": self._hedges_fired,
+            "hedges_won": self._hedges_won,
+            "hedge_hit_rate": self._hedges_won / self._hedges_fired if self._hedges_fired else 0.0,
+            "p95_seconds": {
+                kind: round(_percentile(samples, 0.95), 3)
+                for kind, samples in self._latencies.items() if samples
+            },
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+
+# 싱글톤 인스턴스
+scheduler = UpstreamScheduler()
@@ -0,0 +1,37 @@
+import asyncio
+import importlib
+import logging
+import time
+from config import ANTHROPIC_API_KEY
+from services.scoring import _load_numpy
+from services.upstream import scheduler
+
+logger = logging.getLogger(__name__)
+
+# 첫 사용 시 로드하는 무거운 모듈 (파일 파서)
+LAZY_MODULES = ("pdfplumber", "docx")
+
+
+def _import_modules():
+    for name in LAZY_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.warning(f"사전 로드 실패: {name} ({e})")
+    _load_numpy()
+
+
+async def prewarm():
+    """준비 완료 후 백그라운드에서 지연 로드 모듈과 업스트림 연결을 미리 준비합니다.
+
+    import는 이벤트 루프를 막지 않도록 스레드에서 실행한다.
+    """
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(_import_modules)
+        if ANTHROPIC_API_KEY:
+            await scheduler.warm()
+    except Exception as e:
+        logger.warning(f"사전 준비 실패 ({e})")
+        return
+    logger.info(f"사전 준비 완료 ({(time.perf_counter() - started) * 1000:.0f}ms)")
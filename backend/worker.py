@@ -0,0 +1,70 @@
+"""작업 대기열 워커 프로세스.
+
+JOB_QUEUE_MODE=redis인 API가 Redis에 넣은 텍스트 추출/청크 분석 작업을 처리합니다.
+파싱(CPU)과 분석(업스트림 I/O)은 종류별로 따로 띄워 각각 늘리고 줄일 수 있습니다.
+종료(SIGTERM/Ctrl+C) 시 처리 중인 작업은 바로 대기열로 돌려보내고,
+프로세스가 갑자기 죽으면 임대 시간(JOB_VISIBILITY_TIMEOUT)이 지난 뒤 다른 워커가 회수합니다.
+
+업스트림 RPM/TPM 한도는 프로세스마다 따로 적용되므로 UPSTREAM_PROCESSES를
+API 서버와 이 워커 프로세스 수의 합으로 설정해야 계정 한도를 넘지 않습니다.
+
+사용법:
+    python worker.py --kinds extract_text --concurrency 1
+    python worker.py --kinds analyze_chunk --concurrency 8
+"""
+import argparse
+import asyncio
+import logging
+import signal
+from typing import List, Optional
+
+from config import REDIS_URL, JOB_WORKER_CONCURRENCY
+from services.jobs import ANALYZE_CHUNK, JOB_KINDS, JobWorker, RedisJobQueue, warn_if_rate_limits_unshared
+from services.upstream import scheduler
+
+logger = logging.getLogger("worker")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Redis 작업 대기열 워커")
+    parser.add_argument("--kinds", nargs="+", choices=JOB_KINDS, default=list(JOB_KINDS), help="처리할 작업 종류")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY, help="동시 처리 작업 수")
+    parser.add_argument("--redis-url", default=REDIS_URL)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    return args
+
+
+async def run(args: argparse.Namespace):
+    try:
+        queue = await RedisJobQueue.connect(args.redis_url)
+    except Exception as e:
+        raise SystemExit(f"Redis에 연결할 수 없습니다: {e}")
+
+    task = asyncio.create_task(JobWorker(queue, args.kinds, args.concurrency).run())
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, task.cancel)
+
+    logger.info(f"워커 시작: {', '.join(args.kinds)} (동시 {args.concurrency}개)")
+    if ANALYZE_CHUNK in args.kinds:
+        limits = scheduler.stats()
+        logger.info(
+            f"업스트림 한도 (프로세스 {limits['processes']}개 중 1개 몫): "
+            f"RPM {limits['rpm_limit']:g}, TPM {limits['tpm_limit']:g} (0이면 무제한)"
+        )
+        warn_if_rate_limits_unshared()
+    try:
+        await task
+    except asyncio.CancelledError:
+        logger.info("워커 종료")
+    finally:
+        await queue.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
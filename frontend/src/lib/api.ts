@@ -45,7 +45,44 @@ export async function analyzeText(text: string): Promise<AnalyzeResponse> {
   return response.json();
 }
 
+async function sha256Hex(file: File): Promise<string | null> {
+  // crypto.subtle은 보안 컨텍스트(https, localhost)에서만 사용 가능
+  if (typeof crypto === "undefined" || !crypto.subtle) return null;
+  const digest = await crypto.subtle.digest("SHA-256", await file.arrayBuffer());
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, "0")).join("");
+}
+
+// 해시로 먼저 확인해서 서버에 추출 결과가 있으면 파일을 보내지 않음
+async function checkUploaded(file: File): Promise<FileUploadResponse | null> {
+  let response: Response;
+  try {
+    const sha256 = await sha256Hex(file);
+    if (!sha256) return null;
+
+    response = await fetch(`${API_BASE_URL}/api/upload/check`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({ sha256, size: file.size }),
+    });
+  } catch {
+    // 확인 실패는 그냥 업로드로 진행
+    return null;
+  }
+
+  // 너무 큰 파일은 업로드하지 않고 바로 오류
+  if (response.status === 400) {
+    const error = await response.json();
+    throw new Error(error.detail || "파일 업로드 중 오류가 발생했습니다.");
+  }
+  return response.ok ? response.json() : null;
+}
+
 export async function uploadFile(file: File): Promise<FileUploadResponse> {
+  const uploaded = await checkUploaded(file);
+  if (uploaded) return uploaded;
+
   const formData = new FormData();
   formData.append("file", file);
 